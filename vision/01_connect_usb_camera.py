@@ -1,18 +1,23 @@
 # requirements: sudo apt install luvcview -y
 # chmod a+x usb_camera_test.py
+# 用法: python3 01_connect_usb_camera.py [摄像头编号|视频文件|图片目录]
 
 
+import sys
 import cv2
 import numpy as np
+from camera import ThreadedCapture
 
-cap = cv2.VideoCapture(0)
+cap = ThreadedCapture(sys.argv[1] if len(sys.argv) > 1 else 0)
 while(1):
     # get a frame
     ret, frame = cap.read()
+    if not ret:
+        break
     # show a frame
     cv2.imshow("capture", frame)
     if cv2.waitKey(1) & 0xFF == ord('q'):
         break
+print(cap.stats())
 cap.release()
 cv2.destroyAllWindows() 
-
@@ -1,26 +1,56 @@
 #!/usr/bin/env python3
 
 #导入所需的库
+import sys
 import cv2 as cv
 import numpy as np
+from face_detector import FaceDetector, DETECTION_MODES
+from face_tracker import FaceTracker
+from camera import ThreadedCapture
+from scheduler import FrameScheduler
+#检测模式可通过命令行参数选择: accurate(默认)、fast 或 track(检测+跟踪)
+#第二个参数可指定摄像头编号、视频文件或图片目录
+MODES = list(DETECTION_MODES) + ['track']
+mode = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in MODES else 'accurate'
+#启动时加载并校验一次人脸数据，之后每帧复用
+if mode == 'track':
+    face_detector = FaceTracker(FaceDetector.from_mode('fast'))
+else:
+    face_detector = FaceDetector.from_mode(mode)
+#跳帧调度：检测跟不上时隔帧检测，中间帧沿用上次的人脸框，过期帧直接丢弃
+scheduler = FrameScheduler(max_latency=0.2).add('face')
+last_faces = []
 #检测函数
-def face_detect(image):
-    gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY) #转化图像为灰度图
-    face_detector = cv.CascadeClassifier("./data/haarcascade_frontalface_default.xml")#读取人脸数据
-    faces = face_detector.detectMultiScale(gray,1.02,20)#进行人脸检测
+def face_detect(image, fresh=True):
+    global last_faces
+    if fresh and scheduler.should_run('face'):
+        with scheduler.timed('face'):
+            last_faces = face_detector.detect(image)#进行人脸检测
+    faces = last_faces
     for x, y, w, h in faces:
         cv.rectangle(image, (x, y), (x + w, y + h), (0, 0, 255), 2)#对人脸位置画框
+    if mode == 'track':#显示级联检测的运行比例
+        stats = face_detector.last_stats
+        cv.putText(image, f"cascade: {face_detector.cascade_count}/{face_detector.frame_count} conf: {stats.confidence:.2f}",
+                   (10, 20), cv.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
     cv.imshow("face_detect", image)#展示
 #运行人脸检测并显示
 def video_face_detect():
-    capture = cv.VideoCapture(0)#设置使用的相机
+    capture = ThreadedCapture(sys.argv[2] if len(sys.argv) > 2 else 0)#设置使用的相机
     while True:
         ret, frame = capture.read()#读取相机图像
+        if not ret:
+            break
+        #处理不过来时不检测过期帧（只画上次的人脸框），逐帧回放的文件不按延迟丢帧
+        fresh = scheduler.begin_frame(None if capture.lockstep else capture.frame_time)
         frame = cv.flip(frame, 1)#将回传画面设置图像水平翻转
-        face_detect(frame)#人脸检测
+        face_detect(frame, fresh)#人脸检测
         c = cv.waitKey(10)
         if c==27:  #按下ESC键退出
             break
+    print(capture.stats())
+    print(scheduler.stats())
+    capture.release()
  
 if __name__ == '__main__':
     video_face_detect()#实时检测人脸
@@ -1,101 +1,14 @@
 #标签识别
+#实现位于 tag_recognition 包，这里是带窗口的入口
+#用法: python3 04_tag_recognition.py [摄像头编号|视频文件|图片目录] [--fast] [--roi]
+#无头运行并统计吞吐量: python3 -m tag_recognition 视频或图片目录
 import sys
-import cv2
-import math
-import time
-import numpy as np
-import apriltag
-import RPi.GPIO as GPIO
-
-GPIO.setwarnings(False)
-GPIO.setmode(GPIO.BCM)
-
-#apriltag检测
 
 if sys.version_info.major == 2:
     print('Please run this program with python3!')
     sys.exit(0)
 
-def setBuzzer(sleeptime):
-    GPIO.setup(6, GPIO.OUT) #设置引脚为输出模式
-    GPIO.output(6, 1)       #设置引脚输出高电平
-    time.sleep(sleeptime)   #设置延时
-    GPIO.output(6, 0)
-
-# 检测apriltag
-detector = apriltag.Detector(searchpath=apriltag._get_demo_searchpath())
-def apriltagDetect(img):   
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    detections = detector.detect(gray, return_image=False)
-
-    if len(detections) != 0:
-        for detection in detections:                       
-            corners = np.rint(detection.corners)  # 获取四个角点
-            cv2.drawContours(img, [np.array(corners, np.int)], -1, (0, 255, 255), 2)
-
-            tag_family = str(detection.tag_family, encoding='utf-8')  # 获取tag_family
-            tag_id = int(detection.tag_id)  # 获取tag_id
-
-            object_center_x, object_center_y = int(detection.center[0]), int(detection.center[1])  # 中心点
-            
-            object_angle = int(math.degrees(math.atan2(corners[0][1] - corners[1][1], corners[0][0] - corners[1][0])))  # 计算旋转角
-            
-            return tag_family, tag_id
-            
-    return None, None
-
-state = True
-def run(img):
-    global state
-    global tag_id
-    global action_finish
-     
-    img_h, img_w = img.shape[:2]
-    
-    tag_family, tag_id = apriltagDetect(img) # apriltag检测
-    
-    if tag_id is not None:
-        if state:
-            if tag_id == 1:
-                setBuzzer(0.2)
-                time.sleep(0.5)
-            if tag_id == 2:
-                setBuzzer(0.2)
-                time.sleep(0.5)
-                setBuzzer(0.2)
-                time.sleep(0.5)
-            if tag_id == 3:
-                setBuzzer(0.2)
-                time.sleep(0.5)
-                setBuzzer(0.2)
-                time.sleep(0.5)
-                setBuzzer(0.2)
-                time.sleep(0.5)
-            state = False
-        
-        cv2.putText(img, "tag_id: " + str(tag_id), (10, img.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
-        cv2.putText(img, "tag_family: " + tag_family, (10, img.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
-    else:
-        if not state:
-            state = True
-        cv2.putText(img, "tag_id: None", (10, img.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
-        cv2.putText(img, "tag_family: None", (10, img.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
-    
-    return img
+from tag_recognition.viewer import main
 
 if __name__ == '__main__':
-    
-    cap = cv2.VideoCapture(0) #读取摄像头
-    
-    while True:
-        ret, img = cap.read()
-        if ret:
-            frame = img.copy()
-            Frame = run(frame)           
-            cv2.imshow('Frame', Frame)
-            key = cv2.waitKey(1)
-            if key == 27:
-                break
-        else:
-            time.sleep(0.01)
-    cv2.destroyAllWindows()
\ No newline at end of file
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#色块提取基准测试：findContours + 逐个 contourArea vs connectedComponentsWithStats
+import argparse
+import cv2
+import numpy as np
+
+from bench_utils import time_per_frame, format_timings
+from color_detect import connected_blobs, largest_blob
+
+
+def noisy_masks(count, blobs, size=(640, 480), seed=0):
+    """生成包含大量小噪点色块和少数大色块的二值掩码"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    masks = []
+    for _ in range(count):
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for _ in range(blobs):
+            x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+            cv2.circle(mask, (x, y), int(rng.integers(1, 6)), 255, -1)
+        for _ in range(3):
+            x, y = int(rng.integers(60, width - 60)), int(rng.integers(60, height - 60))
+            cv2.ellipse(mask, (x, y), (int(rng.integers(20, 60)), int(rng.integers(20, 60))),
+                        float(rng.integers(0, 180)), 0, 360, 255, -1)
+        masks.append(mask)
+    return masks
+
+
+def contour_loop(mask, min_area):
+    """原 process_frame() 的做法：所有轮廓逐个计算面积找最大值"""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    best, best_area = None, 0
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area > best_area and area > min_area:
+            best, best_area = contour, area
+    if best is None:
+        return None
+    M = cv2.moments(best)
+    return best, best_area, (M["m10"] / M["m00"], M["m01"] / M["m00"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='色块提取耗时对比（噪声掩码）')
+    parser.add_argument('--frames', type=int, default=50, help='掩码数量')
+    parser.add_argument('--blobs', type=int, nargs='+', default=[100, 300, 1000], help='每个掩码中的噪点色块数')
+    parser.add_argument('--min-area', type=int, default=500, help='最小色块面积')
+    args = parser.parse_args()
+
+    for count in args.blobs:
+        masks = noisy_masks(args.frames, count)
+        n_contours = np.mean([len(cv2.findContours(m, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]) for m in masks])
+        print(f"噪点色块 {count} 个/帧（平均 {n_contours:.0f} 个轮廓）")
+        loop = time_per_frame(lambda m: contour_loop(m, args.min_area), masks)
+        stats = time_per_frame(lambda m: connected_blobs(m, args.min_area), masks)
+        largest = time_per_frame(lambda m: largest_blob(m, args.min_area), masks)
+        print(format_timings('  findContours循环', loop))
+        print(format_timings('  连通域(全部色块)', stats))
+        print(format_timings('  连通域+最大色块轮廓', largest))
+        print(f"  加速比: {loop.mean() / largest.mean():.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+#人脸检测基准测试：对比每帧重新构造级联分类器与复用FaceDetector的单帧耗时
+import argparse
+import cv2 as cv
+
+from bench_utils import load_frames, time_per_frame, format_timings
+from face_detector import FaceDetector, DEFAULT_CASCADE_PATH
+
+
+def legacy_face_detect(frame):
+    """原 face_detect() 的做法：每帧都重新解析级联XML"""
+    gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+    face_detector = cv.CascadeClassifier(DEFAULT_CASCADE_PATH)
+    return face_detector.detectMultiScale(gray, 1.02, 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='人脸检测单帧耗时基准测试')
+    parser.add_argument('--source', default=None, help='视频文件或图片目录，为空时使用随机帧')
+    parser.add_argument('--frames', type=int, default=30, help='参与测试的帧数')
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, limit=args.frames)
+    print(f"测试帧数: {len(frames)}, 分辨率: {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    detector = FaceDetector()
+
+    legacy = time_per_frame(legacy_face_detect, frames)
+    reused = time_per_frame(detector.detect, frames)
+
+    print(format_timings('每帧构造分类器', legacy))
+    print(format_timings('复用FaceDetector', reused))
+    print(f"加速比: {legacy.mean() / reused.mean():.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+#人脸检测模式基准测试：以原始设置(accurate)的结果为参考，比较各模式的FPS和召回率
+import argparse
+import numpy as np
+
+from bench_utils import load_frames, time_per_frame, format_timings, count_matches
+from face_detector import FaceDetector, DETECTION_MODES
+
+
+def run_mode(detector, frames):
+    """按顺序处理所有帧（ROI预测依赖帧间连续性），返回每帧结果和耗时"""
+    results = []
+
+    def step(frame):
+        results.append(detector.detect(frame))
+
+    detector.reset()
+    timings = time_per_frame(step, frames, warmup=0)
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='人脸检测模式FPS与召回率对比')
+    parser.add_argument('source', help='录制的视频文件或图片目录')
+    parser.add_argument('--frames', type=int, default=200, help='参与测试的帧数')
+    parser.add_argument('--iou', type=float, default=0.5, help='判定命中的IoU阈值')
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, limit=args.frames)
+    print(f"测试帧数: {len(frames)}, 分辨率: {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    reference, ref_timings = run_mode(FaceDetector.from_mode('accurate'), frames)
+    total_faces = sum(len(faces) for faces in reference)
+    print(format_timings('accurate (参考)', ref_timings))
+    print(f"参考人脸总数: {total_faces}")
+
+    for mode in DETECTION_MODES:
+        if mode == 'accurate':
+            continue
+        results, timings = run_mode(FaceDetector.from_mode(mode), frames)
+        matched = sum(count_matches(ref, res, args.iou) for ref, res in zip(reference, results))
+        recall = matched / total_faces if total_faces else float('nan')
+        extra = sum(len(res) for res in results) - matched
+        print(format_timings(mode, timings))
+        print(f"    召回率 {recall:.3f} | 多检框数 {extra} | 加速比 {np.mean(ref_timings) / np.mean(timings):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
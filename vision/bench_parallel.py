@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#并行方式基准测试：单线程、线程池、进程池（共享内存传帧）下的人脸和apriltag检测吞吐量
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from bench_utils import load_frames, render_tag_frames, render_face_frames
+from process_pool import ProcessDetectorPool, face_detector_factory, tag_detector_factory
+
+FACTORIES = {'face': face_detector_factory, 'tag': tag_detector_factory}
+
+
+def run_single(detect, frames):
+    return [detect(frame) for frame in frames]
+
+
+def run_processes(pool, frames):
+    return list(pool.map(frames))
+
+
+def measure(func):
+    start = time.perf_counter()
+    results = func()
+    return results, time.perf_counter() - start
+
+
+def same_result(a, b):
+    """比较两次检测的实际结果：人脸比较框坐标，标签比较编号和中心点（同编号的标签顺序不固定，先排序）"""
+    if len(a) != len(b):
+        return False
+    if getattr(a, 'dtype', None) is not None and a.dtype.names:
+        a = a[np.lexsort((a['center'][:, 1], a['center'][:, 0], a['id']))]
+        b = b[np.lexsort((b['center'][:, 1], b['center'][:, 0], b['id']))]
+        return np.array_equal(a['id'], b['id']) and np.allclose(a['center'], b['center'], atol=1e-3)
+    return np.array_equal(np.asarray(a), np.asarray(b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='单线程/线程池/进程池检测吞吐量对比')
+    parser.add_argument('--source', default=None, help='视频文件或图片目录，为空时使用合成帧')
+    parser.add_argument('--face-crops', default=None, help='合成人脸帧用的人脸截图目录，为空时画简单的椭圆人脸')
+    parser.add_argument('--frames', type=int, default=100, help='参与测试的帧数')
+    parser.add_argument('--workers', type=int, default=4, help='线程/进程数')
+    parser.add_argument('--detectors', nargs='+', default=list(FACTORIES), choices=list(FACTORIES))
+    args = parser.parse_args()
+
+    if args.source:
+        recorded = load_frames(args.source, limit=args.frames)
+        frame_sets = {name: recorded for name in FACTORIES}
+    else:
+        # 每个检测器用含有对应目标的合成帧
+        frame_sets = {'face': render_face_frames(args.frames, args.face_crops),
+                      'tag': render_tag_frames(args.frames)}
+    print(f"测试帧数: {args.frames}, 并行度: {args.workers}")
+
+    # 检测器创建、线程/进程启动和预热都不计入耗时，三种方式只比较检测本身
+    for name in args.detectors:
+        factory = FACTORIES[name]
+        frames = frame_sets[name]
+        warmup = frames[:args.workers]
+
+        detect = factory()
+        run_single(detect, warmup)
+        single, t_single = measure(lambda: run_single(detect, frames))
+
+        # 每个线程一个预先创建好的检测器，避免共享有状态的对象
+        detectors = [factory() for _ in range(args.workers)]
+        local = threading.local()
+
+        def init_thread():
+            local.detect = detectors.pop()
+
+        def detect_in_thread(frame):
+            return local.detect(frame)
+
+        with ThreadPoolExecutor(max_workers=args.workers, initializer=init_thread) as pool:
+            list(pool.map(detect_in_thread, warmup))
+            threads, t_threads = measure(lambda: list(pool.map(detect_in_thread, frames)))
+
+        with ProcessDetectorPool(factory, frames[0].shape, workers=args.workers) as pool:
+            run_processes(pool, warmup)
+            procs, t_procs = measure(lambda: run_processes(pool, frames))
+
+        same = all(same_result(a, b) and same_result(a, c) for a, b, c in zip(single, threads, procs))
+        found = sum(len(r) for r in single)
+        print(f"{name}: 共检出 {found} 个目标")
+        if found == 0:
+            print("  ⚠️ 没有检出任何目标，结果只反映空帧上的耗时")
+        for mode, seconds in (('单线程', t_single), ('线程池', t_threads), ('进程池', t_procs)):
+            print(f"  {mode:<6} {len(frames) / seconds:8.1f} FPS  ({seconds / len(frames) * 1000:7.2f} ms/帧)  "
+                  f"加速比 {t_single / seconds:.2f}x")
+        print(f"  三种方式检测结果一致: {'是' if same else '否'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+#视觉基准测试套件：无摄像头、无窗口地把录像或合成帧送入人脸/颜色/标签流水线，
+#按流水线和分辨率报告 p50/p95/p99 延迟、FPS 和峰值内存，并保存为JSON便于跨提交对比
+#用法:
+#  python3 bench_suite.py --output results.json
+#  python3 bench_suite.py --source video.mp4 --resolutions 320x240 640x480 --compare old.json
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import subprocess
+import tracemalloc
+import cv2
+import numpy as np
+
+from bench_utils import (load_frames, render_tag_frames, render_color_frames, render_face_frames,
+                         summarize_timings)
+from color_detect import COLORS
+
+
+def face_pipelines():
+    from face_detector import FaceDetector
+    from face_tracker import FaceTracker
+    return {
+        'face/accurate': FaceDetector.from_mode('accurate').detect,
+        'face/fast': FaceDetector.from_mode('fast').detect,
+        'face/track': FaceTracker(FaceDetector.from_mode('fast')).detect,
+    }
+
+
+def color_pipelines():
+    from color_detect import ColorEngine
+    single, multi = ColorEngine(), ColorEngine()
+    return {
+        'color/red': lambda frame: single.detect(frame, 'red'),
+        'color/all': lambda frame: multi.detect(frame, None),
+    }
+
+
+def tag_pipelines():
+    from tag_recognition import TagRecognizer
+    full, roi = TagRecognizer(feedback=False), TagRecognizer(use_roi=True, feedback=False)
+    fast = TagRecognizer(decimate=True, feedback=False)
+    return {
+        'tag/full': lambda frame: full.detect(frame, draw=False),
+        'tag/fast': lambda frame: fast.detect(frame, draw=False),
+        'tag/roi': lambda frame: roi.detect(frame, draw=False),
+    }
+
+
+# 流水线组 -> (创建流水线的函数, 生成合成帧的函数)
+SUITES = {
+    'face': (face_pipelines, lambda n, args: render_face_frames(n, args.face_crops)),
+    'color': (color_pipelines, lambda n, args: render_color_frames(COLORS, n)),
+    'tag': (tag_pipelines, lambda n, args: render_tag_frames(n)),
+}
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def max_rss_mb():
+    """进程的历史最大常驻内存（MB），Linux 上 ru_maxrss 单位为KB"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024.0 if sys.platform != 'darwin' else rss / (1024.0 * 1024.0)
+
+
+def run_pipeline(func, frames, warmup):
+    """
+    逐帧运行流水线，返回耗时统计和内存数据
+
+    先在不开 tracemalloc 的情况下计时一遍（跟踪分配会拖慢每次分配），
+    再单独跑一遍只用来测峰值分配
+    """
+    for frame in frames[:warmup]:
+        func(frame)
+
+    rss_before = max_rss_mb()
+    timings = np.empty(len(frames), dtype=np.float64)
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        func(frame)
+        timings[i] = (time.perf_counter() - start) * 1000.0
+    rss_after = max_rss_mb()
+
+    tracemalloc.start()
+    for frame in frames:
+        func(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = summarize_timings(timings)
+    # tracemalloc 统计Python和NumPy分配的峰值；OpenCV内部缓冲区只体现在进程RSS中
+    result['peak_traced_mb'] = round(peak / (1024.0 * 1024.0), 3)
+    result['max_rss_mb'] = round(rss_after, 1)
+    result['rss_growth_mb'] = round(rss_after - rss_before, 1)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    """和之前保存的结果对比 p50/p95 延迟"""
+    old = baseline.get('results', {})
+    print(f"\n与 {baseline.get('commit') or '旧结果'} 对比:")
+    for key, current in results.items():
+        if key not in old:
+            continue
+        before = old[key]
+        p50 = (current['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+        p95 = (current['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0.0
+        print(f"  {key:<32} p50 {before['p50_ms']:8.2f} -> {current['p50_ms']:8.2f} ms ({p50:+6.1f}%) | "
+              f"p95 {before['p95_ms']:8.2f} -> {current['p95_ms']:8.2f} ms ({p95:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='视觉流水线无头基准测试套件')
+    parser.add_argument('--suites', nargs='+', default=list(SUITES), choices=list(SUITES), help='要测试的流水线组')
+    parser.add_argument('--source', default=None, help='录制的视频文件或图片目录，为空时每组使用各自的合成帧')
+    parser.add_argument('--face-crops', default=None, help='合成人脸帧用的人脸截图目录')
+    parser.add_argument('--frames', type=int, default=100, help='每个流水线测试的帧数')
+    parser.add_argument('--warmup', type=int, default=5, help='预热帧数（不计时）')
+    parser.add_argument('--resolutions', nargs='+', default=['640x480'], help='测试分辨率，如 320x240 640x480')
+    parser.add_argument('--output', default=None, help='把结果保存为JSON文件')
+    parser.add_argument('--compare', default=None, help='与之前保存的JSON结果对比')
+    args = parser.parse_args()
+
+    recorded = load_frames(args.source, limit=args.frames) if args.source else None
+    results = {}
+    for suite in args.suites:
+        make_pipelines, synthesize = SUITES[suite]
+        base_frames = recorded if recorded is not None else synthesize(args.frames, args)
+        for text in args.resolutions:
+            width, height = parse_resolution(text)
+            frames = [f if f.shape[1::-1] == (width, height) else
+                      cv2.resize(f, (width, height), interpolation=cv2.INTER_AREA) for f in base_frames]
+            # 每个分辨率重新创建流水线，避免跟踪/ROI状态跨分辨率残留
+            for name, func in make_pipelines().items():
+                key = f"{name}@{width}x{height}"
+                result = run_pipeline(func, frames, args.warmup)
+                results[key] = result
+                print(f"{key:<32} p50 {result['p50_ms']:8.2f} | p95 {result['p95_ms']:8.2f} | "
+                      f"p99 {result['p99_ms']:8.2f} ms | {result['fps']:7.1f} FPS | "
+                      f"峰值分配 {result['peak_traced_mb']:6.2f} MB | RSS {result['max_rss_mb']:7.1f} MB")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'source': args.source or 'synthetic',
+        'frames': args.frames,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到 {args.output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
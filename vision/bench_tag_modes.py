@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+#apriltag检测模式基准测试：整帧检测 vs 降采样+ROI检测，在录制序列上测量延迟和命中率
+import argparse
+import cv2
+import numpy as np
+
+from bench_utils import load_frames, render_tag_sequence, time_per_frame, format_timings
+from tag_recognition.detect import create_detector, detect_tags, TagTracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description='apriltag降采样/ROI检测模式延迟对比')
+    parser.add_argument('--source', default=None, help='录制的视频文件或图片目录，为空时渲染移动标签序列')
+    parser.add_argument('--frames', type=int, default=200, help='参与测试的帧数')
+    parser.add_argument('--decimate', type=float, default=2.0, help='降采样倍数（整帧和ROI扫描都用）')
+    parser.add_argument('--interval', type=int, default=10, help='强制整帧扫描的间隔帧数')
+    args = parser.parse_args()
+
+    if args.source:
+        frames = load_frames(args.source, limit=args.frames)
+    else:
+        frames = render_tag_sequence(args.frames)
+    grays = [cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in frames]
+    print(f"测试帧数: {len(grays)}, 分辨率: {grays[0].shape[1]}x{grays[0].shape[0]}")
+
+    detector = create_detector()
+
+    reference = []
+    full = time_per_frame(lambda g: reference.append(set(detect_tags(detector, g)['id'].tolist())),
+                          grays, warmup=0)
+    print(format_timings('整帧检测 (参考)', full))
+
+    configs = [('仅降采样', dict(decimate=args.decimate, full_scan_interval=0)),
+               ('仅ROI', dict(decimate=1.0, full_scan_interval=args.interval)),
+               ('降采样+ROI', dict(decimate=args.decimate, full_scan_interval=args.interval))]
+    total = sum(len(ids) for ids in reference)
+    for name, params in configs:
+        tracker = TagTracker(detector, **params)
+        found = []
+        timings = time_per_frame(lambda g: found.append(set(tracker.detect(g)['id'].tolist())),
+                                 grays, warmup=0)
+        hits = sum(len(ref & res) for ref, res in zip(reference, found))
+        print(format_timings(name, timings))
+        print(f"    命中率 {hits / total if total else float('nan'):.3f} | 整帧扫描 {tracker.full_scan_count} 次 | "
+              f"ROI扫描 {tracker.roi_scan_count} 次 | 加速比 {np.mean(full) / np.mean(timings):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
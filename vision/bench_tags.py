@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+#apriltag检测基准测试：多标签图像上每秒检测帧数和标签数
+import argparse
+import math
+import time
+import cv2
+import numpy as np
+
+from bench_utils import load_frames, render_tag_frames, format_timings
+from tag_recognition.detect import create_detector, detect_tags
+
+
+def legacy_first_tag(detector, gray):
+    """原 apriltagDetect() 的做法：逐个标签用 math 计算，遇到第一个就返回"""
+    for detection in detector.detect(gray, return_image=False):
+        corners = np.rint(detection.corners)
+        tag_family = str(detection.tag_family, encoding='utf-8')
+        math.degrees(math.atan2(corners[0][1] - corners[1][1], corners[0][0] - corners[1][0]))
+        return tag_family, int(detection.tag_id)
+    return None, None
+
+
+def measure(func, grays):
+    """返回 (每帧耗时数组, 检测到的标签总数)"""
+    timings = np.empty(len(grays))
+    total = 0
+    for i, gray in enumerate(grays):
+        start = time.perf_counter()
+        result = func(gray)
+        timings[i] = (time.perf_counter() - start) * 1000.0
+        total += len(result) if isinstance(result, np.ndarray) else int(result[1] is not None)
+    return timings, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='apriltag多标签检测吞吐量测试')
+    parser.add_argument('--source', default=None, help='视频文件或图片目录，为空时渲染合成的多标签帧')
+    parser.add_argument('--frames', type=int, default=50, help='参与测试的帧数')
+    parser.add_argument('--tags', type=int, default=6, help='合成帧中每帧的标签数')
+    args = parser.parse_args()
+
+    if args.source:
+        frames = load_frames(args.source, limit=args.frames)
+    else:
+        frames = render_tag_frames(args.frames, tags_per_frame=args.tags)
+    grays = [cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in frames]
+
+    detector = create_detector()
+
+    legacy, legacy_total = measure(lambda g: legacy_first_tag(detector, g), grays)
+    full, full_total = measure(lambda g: detect_tags(detector, g), grays)
+
+    print(f"测试帧数: {len(grays)}, 分辨率: {grays[0].shape[1]}x{grays[0].shape[0]}")
+    print(format_timings('只取第一个标签', legacy))
+    print(f"    标签/秒 {legacy_total / (legacy.sum() / 1000.0):8.1f} (共 {legacy_total} 个)")
+    print(format_timings('全部标签结构化结果', full))
+    print(f"    标签/秒 {full_total / (full.sum() / 1000.0):8.1f} (共 {full_total} 个)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#基准测试公共工具：读取录制帧、统计耗时
+import os
+import time
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_frames(path=None, limit=100, size=(640, 480)):
+    """
+    读取用于基准测试的帧
+
+    path 可以是视频文件或图片目录；为空时生成随机噪声帧，
+    方便在没有摄像头和录像的机器上运行
+    """
+    frames = []
+    if path is None:
+        rng = np.random.default_rng(0)
+        for _ in range(limit):
+            frames.append(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+        return frames
+
+    if os.path.isdir(path):
+        names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTENSIONS))
+        for name in names[:limit]:
+            img = cv2.imread(os.path.join(path, name))
+            if img is not None:
+                frames.append(img)
+    else:
+        cap = cv2.VideoCapture(path)
+        while len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+
+    if not frames:
+        raise RuntimeError(f"无法从 {path} 读取任何帧")
+    return frames
+
+
+def time_per_frame(func, frames, warmup=3):
+    """逐帧调用 func，返回每帧耗时（毫秒）数组"""
+    for frame in frames[:warmup]:
+        func(frame)
+
+    timings = np.empty(len(frames), dtype=np.float64)
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        func(frame)
+        timings[i] = (time.perf_counter() - start) * 1000.0
+    return timings
+
+
+def format_timings(name, timings):
+    """格式化耗时统计：平均值、中位数、p95 和换算出的FPS"""
+    mean = float(np.mean(timings))
+    fps = 1000.0 / mean if mean > 0 else float('inf')
+    return (f"{name:<24} 平均 {mean:8.2f} ms | 中位数 {np.median(timings):8.2f} ms | "
+            f"p95 {np.percentile(timings, 95):8.2f} ms | {fps:7.1f} FPS")
+
+
+def box_iou(a, b):
+    """计算两组 (x, y, w, h) 框之间的 IoU 矩阵，形状为 len(a) x len(b)"""
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    ax2, ay2 = a[:, 0] + a[:, 2], a[:, 1] + a[:, 3]
+    bx2, by2 = b[:, 0] + b[:, 2], b[:, 1] + b[:, 3]
+    iw = np.clip(np.minimum(ax2[:, None], bx2[None, :]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(ay2[:, None], by2[None, :]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def count_matches(reference, predicted, iou_threshold=0.5):
+    """统计参考框中被预测框命中（IoU >= 阈值）的数量"""
+    if len(reference) == 0 or len(predicted) == 0:
+        return 0
+    return int(np.count_nonzero(box_iou(reference, predicted).max(axis=1) >= iou_threshold))
+
+
+def render_tag(tag_id, size=120):
+    """用 cv2.aruco 的 tag36h11 字典渲染一个带白边的apriltag图像（灰度）"""
+    if not hasattr(cv2, 'aruco'):
+        raise RuntimeError("当前OpenCV没有aruco模块，无法渲染apriltag，请改用录制的图片")
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_APRILTAG_36h11)
+    if hasattr(cv2.aruco, 'generateImageMarker'):
+        marker = cv2.aruco.generateImageMarker(dictionary, tag_id, size)
+    else:
+        marker = cv2.aruco.drawMarker(dictionary, tag_id, size)
+    border = size // 5
+    return cv2.copyMakeBorder(marker, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+
+
+def render_tag_frames(count=30, tags_per_frame=4, size=(640, 480), tag_size=100, seed=0):
+    """生成每帧包含多个随机位置apriltag的合成帧（BGR）"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    frames = []
+    for _ in range(count):
+        frame = np.full((height, width, 3), 180, dtype=np.uint8)
+        frame += rng.integers(0, 30, frame.shape, dtype=np.uint8)
+        cols = max(1, width // (tag_size * 3 // 2))
+        for k in range(tags_per_frame):
+            tag = cv2.cvtColor(render_tag(int(rng.integers(0, 30)), tag_size), cv2.COLOR_GRAY2BGR)
+            th, tw = tag.shape[:2]
+            # 按网格放置避免重叠，再加少量随机偏移
+            gx, gy = (k % cols) * (tw + 10), (k // cols) * (th + 10)
+            x = min(width - tw, gx + int(rng.integers(0, 10)))
+            y = min(height - th, gy + int(rng.integers(0, 10)))
+            frame[y:y + th, x:x + tw] = tag
+        frames.append(frame)
+    return frames
+
+
+def render_tag_sequence(count=100, tag_ids=(1, 2), size=(640, 480), tag_size=100, step=4, seed=0):
+    """生成标签在画面中缓慢移动的合成序列，模拟机器人盯着一两个标记物的场景"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    tags = [cv2.cvtColor(render_tag(tag_id, tag_size), cv2.COLOR_GRAY2BGR) for tag_id in tag_ids]
+    th, tw = tags[0].shape[:2]
+    pos = np.array([[20 + i * (tw + 40), 20 + i * 40] for i in range(len(tags))], dtype=np.float64)
+    vel = rng.uniform(-step, step, pos.shape)
+    limit = np.array([width - tw, height - th], dtype=np.float64)
+
+    frames = []
+    for _ in range(count):
+        frame = np.full((height, width, 3), 180, dtype=np.uint8)
+        frame += rng.integers(0, 30, frame.shape, dtype=np.uint8)
+        for tag, (x, y) in zip(tags, pos.astype(np.int32)):
+            frame[y:y + th, x:x + tw] = tag
+        pos += vel
+        bounce = (pos < 0) | (pos > limit)
+        vel[bounce] = -vel[bounce]
+        pos = np.clip(pos, 0, limit)
+        frames.append(frame)
+    return frames
+
+
+def render_color_frames(colors, count=30, shapes_per_color=2, size=(640, 480), noise=0, seed=0):
+    """
+    生成包含各种颜色色块（圆形和矩形）的合成帧（BGR）
+
+    色块颜色取自每种颜色HSV范围的中点；noise > 0 时额外撒上相应数量的随机彩色噪点
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    bgr_colors = []
+    for spec in colors.values():
+        (h_min, s_min, v_min), (h_max, s_max, v_max) = spec['hsv_min'], spec['hsv_max']
+        hsv = np.uint8([[[(h_min + h_max) // 2, (s_min + s_max) // 2, (v_min + v_max) // 2]]])
+        bgr_colors.append(tuple(int(c) for c in cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)[0, 0]))
+
+    frames = []
+    for _ in range(count):
+        frame = np.full((height, width, 3), 90, dtype=np.uint8)
+        for color in bgr_colors:
+            for k in range(shapes_per_color):
+                x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+                r = int(rng.integers(20, 80))
+                if k % 2 == 0:
+                    cv2.circle(frame, (x, y), r, color, -1)
+                else:
+                    cv2.rectangle(frame, (x - r, y - r // 2), (x + r, y + r // 2), color, -1)
+        if noise:
+            ys = rng.integers(0, height, noise)
+            xs = rng.integers(0, width, noise)
+            frame[ys, xs] = np.asarray(bgr_colors, dtype=np.uint8)[rng.integers(0, len(bgr_colors), noise)]
+        frames.append(frame)
+    return frames
+
+
+def summarize_timings(timings):
+    """耗时（毫秒）统计为字典：平均值、p50/p95/p99、最大值和换算出的FPS"""
+    mean = float(np.mean(timings))
+    p50, p95, p99 = (float(v) for v in np.percentile(timings, [50, 95, 99]))
+    return {'frames': int(len(timings)), 'mean_ms': round(mean, 3), 'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3), 'max_ms': round(float(np.max(timings)), 3),
+            'fps': round(1000.0 / mean, 2) if mean > 0 else None}
+
+
+def render_face_frames(count=30, crops_dir=None, size=(640, 480), faces_per_frame=1, seed=0):
+    """
+    生成人脸测试帧：把 crops_dir 中的人脸截图随机贴到噪声背景上
+
+    没有人脸截图时画出简单的椭圆“人脸”，级联分类器通常检测不到它们，
+    只用于测量耗时
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    crops = []
+    if crops_dir:
+        crops = load_frames(crops_dir, limit=1000)
+
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(60, 120, (height, width, 3), dtype=np.uint8)
+        for _ in range(faces_per_frame):
+            side = int(rng.integers(min(width, height) // 6, min(width, height) // 3))
+            x, y = int(rng.integers(0, width - side)), int(rng.integers(0, height - side))
+            if crops:
+                crop = crops[int(rng.integers(0, len(crops)))]
+                frame[y:y + side, x:x + side] = cv2.resize(crop, (side, side), interpolation=cv2.INTER_AREA)
+            else:
+                center = (x + side // 2, y + side // 2)
+                cv2.ellipse(frame, center, (side // 3, side // 2 - 2), 0, 0, 360, (150, 170, 210), -1)
+                for dx in (-side // 7, side // 7):
+                    cv2.circle(frame, (center[0] + dx, center[1] - side // 8), max(2, side // 20), (40, 40, 40), -1)
+                cv2.ellipse(frame, (center[0], center[1] + side // 6), (side // 8, side // 20), 0, 0, 180, (60, 60, 120), 2)
+        frames.append(frame)
+    return frames
@@ -0,0 +1,180 @@
+#共享的摄像头采集模块：后台线程持续抓帧，只保留最新的一帧
+import os
+import time
+import threading
+import cv2
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class ImageFolderSource:
+    """把图片目录包装成类似 cv2.VideoCapture 的帧源，按文件名顺序回放"""
+
+    def __init__(self, path):
+        self.paths = [os.path.join(path, n) for n in sorted(os.listdir(path))
+                      if n.lower().endswith(IMAGE_EXTENSIONS)]
+        self.index = 0
+
+    def isOpened(self):
+        return len(self.paths) > 0
+
+    def read(self):
+        while self.index < len(self.paths):
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def release(self):
+        self.index = len(self.paths)
+
+
+def parse_source(source):
+    """命令行参数转帧源：纯数字为摄像头编号，否则为视频文件或图片目录"""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+def default_config():
+    """
+    摄像头的默认采集配置：环境变量 CAMERA_MODE（如 '1280x720@30/MJPG'）优先，
+    否则为 640x480@30、MJPG、驱动缓冲区1帧
+    """
+    from camera_config import CaptureConfig
+    mode = os.environ.get('CAMERA_MODE')
+    return CaptureConfig.parse(mode) if mode else CaptureConfig()
+
+
+def open_source(source, config=None):
+    """
+    打开底层帧源：摄像头编号、视频文件或图片目录
+
+    config（CaptureConfig）只对摄像头生效，为 None 时使用 default_config()
+    """
+    source = parse_source(source)
+    if isinstance(source, str) and os.path.isdir(source):
+        return ImageFolderSource(source)
+    if isinstance(source, int):
+        from camera_config import open_camera
+        return open_camera(source, config if config is not None else default_config())
+    return cv2.VideoCapture(source)
+
+
+class ThreadedCapture:
+    """
+    带后台抓帧线程的采集器
+
+    抓帧线程不断调用底层 read()，只保留最新一帧，处理慢时旧帧直接丢弃，
+    避免V4L2队列里积压过期图像。read() 直接返回最新帧的引用而不复制：
+    每次抓帧都会得到新的数组，所以调用方持有的帧不会被后台覆盖。
+    frame_time 为最近一次 read() 返回的帧的采集时刻，可用于计算处理延迟。
+
+    回放视频文件或图片目录时：replay_fps 为 None 表示逐帧同步回放（不丢帧，
+    便于测试复现）；给定 replay_fps 则按该帧率模拟实时摄像头（会丢帧）。
+    config 为 camera_config.CaptureConfig，用于设置摄像头的分辨率、帧率、格式和缓冲区
+    """
+
+    def __init__(self, source=0, replay_fps=None, config=None):
+        self.source = parse_source(source)
+        self.cap = open_source(self.source, config)
+        self.is_live = isinstance(self.source, int)
+        self.lockstep = not self.is_live and replay_fps is None
+        self.frame_interval = 1.0 / replay_fps if (not self.is_live and replay_fps) else 0.0
+
+        self.cond = threading.Condition()
+        self.frame = None
+        self.frame_stamp = 0.0     # 最新帧的采集时刻（time.perf_counter()）
+        self.frame_time = 0.0      # 最近一次交给调用方的帧的采集时刻
+        self.frame_id = 0          # 最新帧的序号
+        self.delivered_id = 0      # 最近一次交给调用方的帧序号
+        self.finished = False
+        self.running = False
+
+        # 统计信息
+        self.grabbed_count = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
+
+        self.thread = None
+        if self.cap.isOpened():
+            self.start()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _grab_loop(self):
+        next_time = time.perf_counter()
+        while self.running:
+            if self.lockstep:
+                # 同步回放：等调用方取走上一帧再读下一帧
+                with self.cond:
+                    while self.running and self.frame_id != self.delivered_id:
+                        self.cond.wait()
+            elif self.frame_interval:
+                next_time += self.frame_interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            ret, frame = self.cap.read()
+            with self.cond:
+                if not ret:
+                    self.finished = True
+                    self.cond.notify_all()
+                    break
+                if self.frame_id != self.delivered_id:
+                    self.dropped_count += 1  # 上一帧还没被取走就被覆盖
+                self.frame = frame
+                self.frame_stamp = time.perf_counter()
+                self.frame_id += 1
+                self.grabbed_count += 1
+                self.cond.notify_all()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, timeout=2.0):
+        """
+        等待一帧比上次更新的图像，返回 (ret, frame)
+
+        帧源结束、采集器已释放或超时时返回 (False, None)
+        """
+        with self.cond:
+            deadline = time.monotonic() + timeout
+            while self.frame_id == self.delivered_id:
+                if self.finished or not self.running:
+                    return False, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None
+                self.cond.wait(remaining)
+            self.delivered_id = self.frame_id
+            self.frame_time = self.frame_stamp
+            self.delivered_count += 1
+            self.cond.notify_all()
+            return True, self.frame
+
+    def stats(self):
+        """返回抓帧/交付/丢弃的帧数统计"""
+        return {'grabbed': self.grabbed_count,
+                'delivered': self.delivered_count,
+                'dropped': self.dropped_count}
+
+    def release(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+#摄像头采集配置：分辨率、帧率、MJPG格式和驱动缓冲区大小，并检查驱动是否真的采用了这些设置
+#探测各模式的实际帧率和采集到处理的延迟:
+#  python3 camera_config.py --device 0 --modes 640x480@30/MJPG 640x480@30/YUYV 1280x720@30/MJPG
+import re
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+MODE_PATTERN = re.compile(r'^(\d+)x(\d+)(?:@(\d+(?:\.\d+)?))?(?:/(\w{4}))?$')
+
+
+class CaptureConfig:
+    """
+    摄像头采集参数
+
+    None 表示保持驱动默认值。USB摄像头默认一般是YUYV格式，高分辨率下帧率受USB带宽限制，
+    改用MJPG通常能拿到标称帧率；buffer_size=1 让驱动只保留最新的一帧
+    """
+
+    def __init__(self, width=640, height=480, fps=30, fourcc='MJPG', buffer_size=1):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+
+    @classmethod
+    def parse(cls, text, buffer_size=1):
+        """解析 '宽x高[@帧率][/格式]'，例如 '640x480@30/MJPG'"""
+        match = MODE_PATTERN.match(text.strip())
+        if not match:
+            raise ValueError(f"无法解析采集模式: {text}（示例: 640x480@30/MJPG）")
+        width, height, fps, fourcc = match.groups()
+        return cls(int(width), int(height), float(fps) if fps else None,
+                   fourcc.upper() if fourcc else None, buffer_size)
+
+    def __str__(self):
+        text = f"{self.width}x{self.height}"
+        if self.fps:
+            text += f"@{self.fps:g}"
+        if self.fourcc:
+            text += f"/{self.fourcc}"
+        return text
+
+
+def decode_fourcc(value):
+    """把 CAP_PROP_FOURCC 返回的浮点数还原为4个字符"""
+    code = int(value)
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def apply_config(cap, config):
+    """
+    把配置写入已打开的 VideoCapture 并读回检查
+
+    返回 {属性: (请求值, 实际值)} 和未被采用的属性列表。
+    V4L2 需要先设置像素格式再设置分辨率，否则分辨率可能被重置
+    """
+    if config.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+    if config.width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+    if config.height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+    if config.fps:
+        cap.set(cv2.CAP_PROP_FPS, config.fps)
+    if config.buffer_size is not None:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+
+    actual = {
+        'fourcc': (config.fourcc, decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC))),
+        'width': (config.width, int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))),
+        'height': (config.height, int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+        'fps': (config.fps, cap.get(cv2.CAP_PROP_FPS)),
+        'buffer_size': (config.buffer_size, int(cap.get(cv2.CAP_PROP_BUFFERSIZE))),
+    }
+    rejected = []
+    for name, (requested, value) in actual.items():
+        if requested is None:
+            continue
+        if name == 'fps':
+            ok = abs(value - requested) < 0.5
+        elif name == 'fourcc':
+            ok = value.upper() == requested.upper()
+        else:
+            ok = value == requested
+        if not ok:
+            rejected.append(name)
+    return actual, rejected
+
+
+def open_device(index=0):
+    """打开摄像头但不改任何参数；Linux 上显式使用 V4L2 后端以便设置格式和缓冲区"""
+    if sys.platform.startswith('linux'):
+        return cv2.VideoCapture(index, cv2.CAP_V4L2)
+    return cv2.VideoCapture(index)
+
+
+def open_camera(index=0, config=None, verbose=True):
+    """按配置打开摄像头，未采用的参数打印警告"""
+    cap = open_device(index)
+    if config is not None and cap.isOpened():
+        actual, rejected = apply_config(cap, config)
+        if verbose and rejected:
+            details = ', '.join(f"{name} 请求 {actual[name][0]} 实际 {actual[name][1]}" for name in rejected)
+            print(f"⚠️ 摄像头未完全采用配置 {config}: {details}")
+    return cap
+
+
+def probe_mode(index, config, seconds=3.0, work_ms=0.0):
+    """
+    测量一种采集模式：驱动实际采用的参数、实际帧率和采集到处理的延迟
+
+    延迟优先用驱动给出的缓冲区时间戳（CAP_PROP_POS_MSEC，V4L2 下为单调时钟毫秒），
+    驱动返回 0/-1 或明显不是单调时钟的值时退化为相邻两次 read() 返回的间隔
+    （此时只能反映读取间隔），结果中 latency_source 为 'driver' 或 'read'。
+    work_ms 模拟每帧的处理耗时，用来观察驱动缓冲区积压对延迟的影响
+    """
+    cap = open_device(index)
+    if not cap.isOpened():
+        return None
+    actual, rejected = apply_config(cap, config)
+
+    # 丢掉启动阶段的帧
+    for _ in range(5):
+        cap.read()
+
+    latencies = []
+    intervals = []
+    frames = 0
+    last_ms = None
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        ret, _ = cap.read()
+        if not ret:
+            break
+        frames += 1
+        stamp = cap.get(cv2.CAP_PROP_POS_MSEC)
+        now_ms = time.monotonic() * 1000.0
+        if stamp > 0 and 0 < now_ms - stamp < 10000:
+            latencies.append(now_ms - stamp)
+        if last_ms is not None:
+            intervals.append(now_ms - last_ms)
+        last_ms = now_ms
+        if work_ms:
+            time.sleep(work_ms / 1000.0)
+    elapsed = time.perf_counter() - start
+    cap.release()
+
+    result = {'mode': str(config), 'actual': actual, 'rejected': rejected,
+              'delivered_fps': frames / elapsed if elapsed else 0.0}
+    # 大部分帧都有可用的驱动时间戳时才采用，否则用读取间隔
+    if latencies and len(latencies) >= frames // 2:
+        result['latency_source'] = 'driver'
+    elif intervals:
+        latencies = intervals
+        result['latency_source'] = 'read'
+    if latencies:
+        result['latency_ms'] = (float(np.median(latencies)), float(np.percentile(latencies, 95)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='探测摄像头各采集模式的实际帧率和延迟')
+    parser.add_argument('--device', type=int, default=0, help='摄像头编号')
+    parser.add_argument('--modes', nargs='+', default=['640x480@30/MJPG', '640x480@30/YUYV', '1280x720@30/MJPG'],
+                        help='采集模式，格式 宽x高[@帧率][/格式]')
+    parser.add_argument('--buffer-size', type=int, default=1, help='CAP_PROP_BUFFERSIZE')
+    parser.add_argument('--seconds', type=float, default=3.0, help='每个模式的测量时长')
+    parser.add_argument('--work-ms', type=float, default=0.0, help='模拟每帧处理耗时（毫秒）')
+    args = parser.parse_args()
+
+    for text in args.modes:
+        config = CaptureConfig.parse(text, args.buffer_size)
+        result = probe_mode(args.device, config, args.seconds, args.work_ms)
+        if result is None:
+            print(f"{text}: 无法打开摄像头 {args.device}")
+            continue
+        actual = result['actual']
+        got = (f"{actual['width'][1]}x{actual['height'][1]}@{actual['fps'][1]:g}/{actual['fourcc'][1]} "
+               f"buffer={actual['buffer_size'][1]}")
+        line = f"{text:<20} 实际 {got:<28} 实际帧率 {result['delivered_fps']:6.1f} FPS"
+        if result.get('latency_source') == 'driver':
+            line += f" | 采集到处理延迟 p50 {result['latency_ms'][0]:6.1f} ms p95 {result['latency_ms'][1]:6.1f} ms"
+        elif 'latency_ms' in result:
+            line += (f" | 驱动未提供时间戳，读取间隔 p50 {result['latency_ms'][0]:6.1f} ms "
+                     f"p95 {result['latency_ms'][1]:6.1f} ms")
+        else:
+            line += " | 帧数不足，无法测量延迟"
+        if result['rejected']:
+            line += f" | 未采用: {', '.join(result['rejected'])}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,485 @@
+#颜色检测：颜色定义、单色掩码和一次查表的多颜色分割
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+
+# 颜色定义
+COLORS = {
+    'red': {'hsv_min': (0, 120, 70), 'hsv_max': (10, 255, 255), 'rgb': (0, 0, 255)},
+    'green': {'hsv_min': (35, 120, 70), 'hsv_max': (85, 255, 255), 'rgb': (0, 255, 0)},
+    'blue': {'hsv_min': (100, 120, 70), 'hsv_max': (130, 255, 255), 'rgb': (255, 0, 0)},
+    'yellow': {'hsv_min': (20, 120, 70), 'hsv_max': (30, 255, 255), 'rgb': (0, 255, 255)},
+    'purple': {'hsv_min': (130, 120, 70), 'hsv_max': (160, 255, 255), 'rgb': (255, 0, 255)}
+}
+
+
+# 处理红色的特殊情况（在HSV空间中跨越0度）
+def create_red_mask(hsv_image, h_min, s_min, v_min, h_max, s_max, v_max):
+    if h_min > h_max:  # 红色跨越0度
+        lower_red1 = np.array([h_min, s_min, v_min])
+        upper_red1 = np.array([179, s_max, v_max])
+        mask1 = cv2.inRange(hsv_image, lower_red1, upper_red1)
+        
+        lower_red2 = np.array([0, s_min, v_min])
+        upper_red2 = np.array([h_max, s_max, v_max])
+        mask2 = cv2.inRange(hsv_image, lower_red2, upper_red2)
+        
+        return cv2.bitwise_or(mask1, mask2)
+    else:
+        lower_red = np.array([h_min, s_min, v_min])
+        upper_red = np.array([h_max, s_max, v_max])
+        return cv2.inRange(hsv_image, lower_red, upper_red)
+
+
+# 一个色块：像素面积、外接矩形 (x, y, w, h)、质心 (cx, cy)、外轮廓（掩码坐标）
+Blob = namedtuple('Blob', ['area', 'bbox', 'centroid', 'contour'])
+
+
+def connected_blobs(mask, min_area=0, connectivity=8):
+    """
+    一次 connectedComponentsWithStats 得到掩码中所有色块的面积、外接矩形和质心
+
+    返回 (labels, stats, centroids, ids)：ids 为面积大于 min_area 的色块编号，按面积从大到小排列，
+    stats/centroids 按色块编号索引（0号为背景）
+    """
+    _, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=connectivity)
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    ids = np.flatnonzero(areas > min_area)
+    ids = ids[np.argsort(-areas[ids], kind='stable')] + 1
+    return labels, stats, centroids, ids
+
+
+def blob_contour(labels, stats, blob_id, offset=(0, 0)):
+    """只在该色块的外接矩形内提取它的外轮廓，offset 为 labels 左上角在原图中的位置"""
+    x, y, w, h = (int(v) for v in stats[blob_id, :4])
+    crop = cv2.compare(labels[y:y + h, x:x + w], int(blob_id), cv2.CMP_EQ)
+    contours, _ = cv2.findContours(crop, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                   offset=(x + offset[0], y + offset[1]))
+    return max(contours, key=len)
+
+
+def largest_blob(mask, min_area=0, connectivity=8, crop=False, offset=(0, 0)):
+    """
+    返回面积最大且大于 min_area 的色块（Blob），没有时返回 None；只为这一个色块提取轮廓
+
+    crop=True 时先裁到所有前景像素的外接矩形再做连通域标记，前景稀疏时能省掉大部分开销。
+    offset 为 mask 左上角在原图中的位置，返回的坐标都是原图坐标
+    """
+    ox, oy = offset
+    if crop:
+        x, y, w, h = cv2.boundingRect(mask)
+        if w == 0 or h == 0:
+            return None
+        mask = mask[y:y + h, x:x + w]
+        ox, oy = ox + x, oy + y
+    _, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=connectivity)
+    if stats.shape[0] < 2:
+        return None
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    blob_id = int(np.argmax(areas)) + 1
+    area = int(stats[blob_id, cv2.CC_STAT_AREA])
+    if area <= min_area:
+        return None
+    x, y, w, h = (int(v) for v in stats[blob_id, :4])
+    centroid = (float(centroids[blob_id, 0]) + ox, float(centroids[blob_id, 1]) + oy)
+    return Blob(area, (x + ox, y + oy, w, h), centroid, blob_contour(labels, stats, blob_id, (ox, oy)))
+
+
+class MultiColorSegmenter:
+    """
+    多颜色分割
+
+    每个颜色占一个比特位：H、S、V 各用一张256项查找表映射为“该值落在哪些颜色的范围内”
+    的位掩码，三者按位与后第 i 位为1表示像素落在 names[i] 的阈值内。一次 cv2.LUT/bitwise_and
+    处理整幅HSV图像就得到所有颜色的 inRange 结果，颜色范围重叠时一个像素可以同时属于
+    多种颜色，与每种颜色单独 inRange 完全一致。h_min > h_max 时按跨越0度处理，
+    与 create_red_mask 一致。之后每种颜色在自己的前景外接矩形内单独做开/闭运算
+    """
+
+    def __init__(self, colors=COLORS, kernel_size=5):
+        self.names = list(colors)
+        if len(self.names) > 31:
+            raise ValueError("最多支持31种颜色")
+        self.thresholds = {name: (tuple(colors[name]['hsv_min']), tuple(colors[name]['hsv_max']))
+                           for name in self.names}
+        self.kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        # 开运算再闭运算，前景外接矩形外扩 kernel_size 后在裁剪图上做形态学与整幅图结果相同
+        self.margin = kernel_size
+        # cv2.LUT 的输出深度跟随查找表：8种颜色以内用 uint8，更多时用 uint16/int32
+        if len(self.names) <= 8:
+            dtype = np.uint8
+        elif len(self.names) <= 16:
+            dtype = np.uint16
+        else:
+            dtype = np.int32
+        self.bits = [1 << i for i in range(len(self.names))]
+        self.hue_bits = np.zeros(256, dtype=dtype)
+        self.sat_bits = np.zeros(256, dtype=dtype)
+        self.val_bits = np.zeros(256, dtype=dtype)
+        self._build_luts()
+
+    def set_thresholds(self, name, hsv_min, hsv_max):
+        """更新某个颜色的HSV阈值并重建查找表"""
+        self.update_thresholds({name: (hsv_min, hsv_max)})
+
+    def update_thresholds(self, thresholds):
+        """批量更新 {颜色: (hsv_min, hsv_max)}，有变化时只重建一次查找表"""
+        changed = False
+        for name, (hsv_min, hsv_max) in thresholds.items():
+            value = (tuple(hsv_min), tuple(hsv_max))
+            if self.thresholds.get(name) != value:
+                self.thresholds[name] = value
+                changed = True
+        if changed:
+            self._build_luts()
+
+    def _build_luts(self):
+        self.hue_bits[:] = 0
+        self.sat_bits[:] = 0
+        self.val_bits[:] = 0
+        levels = np.arange(256)
+        for name, bit in zip(self.names, self.bits):
+            (h_min, s_min, v_min), (h_max, s_max, v_max) = self.thresholds[name]
+            if h_min > h_max:  # 跨越0度
+                hue_in = ((levels >= h_min) & (levels <= 179)) | (levels <= h_max)
+            else:
+                hue_in = (levels >= h_min) & (levels <= h_max)
+            self.hue_bits[hue_in] |= bit
+            self.sat_bits[(levels >= s_min) & (levels <= s_max)] |= bit
+            self.val_bits[(levels >= v_min) & (levels <= v_max)] |= bit
+
+    def classify(self, hsv):
+        """返回与图像同尺寸的颜色位掩码图，第 i 位对应 names[i]"""
+        h, s, v = cv2.split(hsv)
+        bits = cv2.LUT(h, self.hue_bits)
+        cv2.bitwise_and(bits, cv2.LUT(s, self.sat_bits), dst=bits)
+        cv2.bitwise_and(bits, cv2.LUT(v, self.val_bits), dst=bits)
+        return bits
+
+    def color_mask(self, bits, name):
+        """从位掩码图取出某个颜色的 0/255 掩码，等价于该颜色单独做 inRange"""
+        bit = self.bits[self.names.index(name)]
+        return cv2.compare(cv2.bitwise_and(bits, bit), 0, cv2.CMP_GT)
+
+    def clean(self, mask):
+        """
+        对单个颜色的掩码做开/闭运算，只处理前景外接矩形外扩 margin 的区域
+
+        返回 (去噪后的裁剪掩码, 裁剪区域左上角 (x, y))，没有前景时返回 (None, None)
+        """
+        x, y, w, h = cv2.boundingRect(mask)
+        if w == 0 or h == 0:
+            return None, None
+        height, width = mask.shape[:2]
+        x1, y1 = max(x - self.margin, 0), max(y - self.margin, 0)
+        x2, y2 = min(x + w + self.margin, width), min(y + h + self.margin, height)
+        crop = cv2.morphologyEx(mask[y1:y2, x1:x2], cv2.MORPH_OPEN, self.kernel)
+        cv2.morphologyEx(crop, cv2.MORPH_CLOSE, self.kernel, dst=crop)
+        return crop, (x1, y1)
+
+    def largest_blobs(self, bits, min_area=0):
+        """每种颜色取面积最大（且大于 min_area）的色块，返回 {颜色: Blob}"""
+        blobs = {}
+        for name in self.names:
+            mask, offset = self.clean(self.color_mask(bits, name))
+            if mask is None:
+                continue
+            blob = largest_blob(mask, min_area, crop=True, offset=offset)
+            if blob is not None:
+                blobs[name] = blob
+        return blobs
+
+    def process(self, hsv, min_area=0):
+        """分类 -> 每种颜色去噪 -> 每种颜色的最大色块"""
+        return self.largest_blobs(self.classify(hsv), min_area)
+
+
+# 阈值滑动条的顺序，对应 ColorContext.set_threshold 的 index
+THRESHOLD_NAMES = ('h_min', 's_min', 'v_min', 'h_max', 's_max', 'v_max')
+
+
+class StageTimer:
+    """按阶段累计耗时：start() 开始一帧，lap(name) 记录从上一个时间点到现在的耗时"""
+
+    def __init__(self):
+        self.totals = {}
+        self.frames = 0
+        self.last = 0.0
+
+    def start(self):
+        self.frames += 1
+        self.last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.totals[name] = self.totals.get(name, 0.0) + (now - self.last)
+        self.last = now
+
+    def reset(self):
+        self.totals = {}
+        self.frames = 0
+
+    def report(self):
+        """返回每个阶段的平均耗时（毫秒）和占比"""
+        if self.frames == 0:
+            return "还没有处理任何帧"
+        total = sum(self.totals.values())
+        lines = [f"各阶段平均耗时（{self.frames} 帧）:"]
+        for name, seconds in self.totals.items():
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"  {name:<12} {seconds / self.frames * 1000:7.2f} ms  {share:5.1f}%")
+        lines.append(f"  {'合计':<10} {total / self.frames * 1000:7.2f} ms")
+        return "\n".join(lines)
+
+
+class ColorContext:
+    """
+    单色识别的预分配处理上下文
+
+    阈值和面积阈值只在滑动条回调里更新（set_threshold / set_area_threshold），
+    inRange 用的上下界数组随阈值变化预先算好；HSV图、掩码、形态学中间结果都写入
+    复用的缓冲区（dst=），图像或ROI尺寸不变时每帧不再分配新数组。
+    timer 记录每个处理阶段的耗时
+    """
+
+    def __init__(self, colors=COLORS, area_threshold=5000, kernel_size=5):
+        self.thresholds = {name: list(colors[name]['hsv_min']) + list(colors[name]['hsv_max'])
+                           for name in colors}
+        self.bounds = {}
+        for name in colors:
+            self._update_bounds(name)
+        self.area_threshold = area_threshold
+        self.kernel = np.ones((kernel_size, kernel_size), np.uint8)
+        self.timer = StageTimer()
+
+        self.output = None  # 显示用的帧副本
+        self.hsv = None
+        self.mask = None
+        self.mask2 = None   # 跨越0度时的第二个掩码
+        self.morph = None   # 形态学中间结果
+
+    def set_threshold(self, color, index, value):
+        """滑动条回调：index 为 THRESHOLD_NAMES 中的位置"""
+        self.thresholds[color][index] = value
+        self._update_bounds(color)
+
+    def set_area_threshold(self, value):
+        self.area_threshold = value
+
+    def get_thresholds(self, color):
+        """返回 (hsv_min, hsv_max)"""
+        values = self.thresholds[color]
+        return tuple(values[:3]), tuple(values[3:])
+
+    def _update_bounds(self, color):
+        h_min, s_min, v_min, h_max, s_max, v_max = self.thresholds[color]
+        if h_min > h_max:  # 跨越0度，拆成两个区间
+            self.bounds[color] = [
+                (np.array([h_min, s_min, v_min], np.uint8), np.array([179, s_max, v_max], np.uint8)),
+                (np.array([0, s_min, v_min], np.uint8), np.array([h_max, s_max, v_max], np.uint8)),
+            ]
+        else:
+            self.bounds[color] = [
+                (np.array([h_min, s_min, v_min], np.uint8), np.array([h_max, s_max, v_max], np.uint8)),
+            ]
+
+    @staticmethod
+    def _reuse(buffer, shape):
+        """尺寸不变时复用缓冲区，否则重新分配"""
+        if buffer is None or buffer.shape != shape:
+            return np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def copy_frame(self, frame):
+        """把帧复制到复用的显示缓冲区"""
+        self.output = self._reuse(self.output, frame.shape)
+        np.copyto(self.output, frame)
+        return self.output
+
+    def to_hsv(self, frame):
+        self.hsv = self._reuse(self.hsv, frame.shape)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self.hsv)
+
+    def color_mask(self, hsv, color):
+        """对 hsv（整帧或ROI视图）生成去噪后的颜色掩码，结果位于复用的缓冲区中"""
+        shape = hsv.shape[:2]
+        self.mask = self._reuse(self.mask, shape)
+        self.morph = self._reuse(self.morph, shape)
+
+        bounds = self.bounds[color]
+        cv2.inRange(hsv, bounds[0][0], bounds[0][1], dst=self.mask)
+        if len(bounds) > 1:
+            self.mask2 = self._reuse(self.mask2, shape)
+            cv2.inRange(hsv, bounds[1][0], bounds[1][1], dst=self.mask2)
+            cv2.bitwise_or(self.mask, self.mask2, dst=self.mask)
+        self.timer.lap('inRange')
+
+        # 应用形态学操作减少噪点
+        cv2.morphologyEx(self.mask, cv2.MORPH_OPEN, self.kernel, dst=self.morph)
+        cv2.morphologyEx(self.morph, cv2.MORPH_CLOSE, self.kernel, dst=self.mask)
+        self.timer.lap('morphology')
+        return self.mask
+
+
+# 一个颜色检测结果：颜色名、质心 (cx, cy)、面积、轮廓（原图坐标）
+ColorDetection = namedtuple('ColorDetection', ['color', 'centroid', 'area', 'contour'])
+
+
+def normalize_roi(roi, shape):
+    """把鼠标拖出的 (x1, y1, x2, y2) 整理为左上/右下顺序并限制在图像内，无效时返回 None"""
+    if not roi or len(roi) != 4:
+        return None
+    height, width = shape[:2]
+    x1, y1, x2, y2 = roi
+    x1, x2 = sorted((min(max(x1, 0), width), min(max(x2, 0), width)))
+    y1, y2 = sorted((min(max(y1, 0), height), min(max(y2, 0), height)))
+    if x2 - x1 < 1 or y2 - y1 < 1:
+        return None
+    return x1, y1, x2, y2
+
+
+class ColorEngine:
+    """
+    颜色检测引擎，不依赖HighGUI窗口，也不在图像上画任何东西
+
+    detect() 返回按面积从大到小排列的 ColorDetection 列表；
+    color 为颜色名时只检测该颜色，为 None 时用 MultiColorSegmenter 一次检测所有颜色。
+    阈值保存在 context（ColorContext）中，由调用方（滑动条回调、配置文件等）更新
+    """
+
+    def __init__(self, context=None, segmenter=None):
+        self.context = context if context is not None else ColorContext()
+        self.segmenter = segmenter if segmenter is not None else MultiColorSegmenter()
+        self.timer = self.context.timer
+        self.mask = None  # 最近一次单色检测的掩码（ROI尺寸），供显示使用
+
+    def detect(self, frame, color=None, roi=None, hsv=None):
+        """hsv 可以传入已经转换好的HSV图（例如多个检测器共享同一帧时），省去一次 cvtColor"""
+        ctx = self.context
+        self.timer.start()
+
+        if hsv is None:
+            hsv = ctx.to_hsv(frame)
+        self.timer.lap('cvtColor')
+
+        roi = normalize_roi(roi, frame.shape)
+        if roi is not None:
+            x1, y1, x2, y2 = roi
+            hsv = hsv[y1:y2, x1:x2]
+
+        if color is None:
+            self.segmenter.update_thresholds({name: ctx.get_thresholds(name) for name in ctx.thresholds})
+            blobs = self.segmenter.process(hsv, ctx.area_threshold)
+            self.mask = None
+            self.timer.lap('segment')
+        else:
+            self.mask = ctx.color_mask(hsv, color)
+            # 连通域统计一次得到所有色块，只为最大的色块提取轮廓
+            blob = largest_blob(self.mask, ctx.area_threshold, crop=True)
+            blobs = {color: blob} if blob is not None else {}
+            self.timer.lap('blobs')
+
+        detections = []
+        for name, blob in blobs.items():
+            cx, cy = int(blob.centroid[0]), int(blob.centroid[1])
+            contour = blob.contour
+            # 如果使用ROI，调整坐标
+            if roi is not None:
+                cx += roi[0]
+                cy += roi[1]
+                contour = contour + np.array([[roi[0], roi[1]]], dtype=contour.dtype)
+            detections.append(ColorDetection(name, (cx, cy), float(blob.area), contour))
+        detections.sort(key=lambda d: d.area, reverse=True)
+        return detections
+
+
+# 平滑后的结果：稳定的颜色、指数平滑后的质心 (cx, cy)、窗口内出现该颜色的帧比例
+SmoothedDetection = namedtuple('SmoothedDetection', ['color', 'centroid', 'confidence'])
+
+
+class ColorSmoother:
+    """
+    检测结果的时间平滑和迟滞
+
+    环形缓冲区保存最近 history_size 帧检测到的颜色（每帧一个位掩码），同时维护每种颜色
+    在窗口内出现的帧数，新帧进入、旧帧移出时只增减对应计数，每帧耗时与窗口长度无关。
+    某颜色出现帧数达到 enter_count 才进入稳定状态，降到 exit_count 以下才退出，
+    避免在两种颜色之间来回跳变；稳定颜色的质心按 alpha 做指数平滑
+    """
+
+    def __init__(self, colors=COLORS, history_size=5, enter_count=3, exit_count=2, alpha=0.4):
+        if not 0 < exit_count <= enter_count <= history_size:
+            raise ValueError("需要满足 0 < exit_count <= enter_count <= history_size")
+        self.names = list(colors)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.history_size = history_size
+        self.enter_count = enter_count
+        self.exit_count = exit_count
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.ring = [0] * self.history_size  # 每帧检测到的颜色位掩码
+        self.pos = 0
+        self.filled = 0
+        self.counts = [0] * len(self.names)
+        self.centroids = [None] * len(self.names)  # 每种颜色的平滑质心
+        self.stable = None  # 当前稳定颜色的下标
+
+    def update(self, detections):
+        """加入一帧的检测结果（ColorDetection 列表），返回 SmoothedDetection 或 None"""
+        bits = 0
+        for detection in detections:
+            i = self.index[detection.color]
+            if bits & (1 << i):
+                continue  # 同一颜色只计一次，质心取面积最大的那个（列表按面积降序）
+            bits |= 1 << i
+            cx, cy = detection.centroid
+            previous = self.centroids[i]
+            if previous is None:
+                self.centroids[i] = (float(cx), float(cy))
+            else:
+                a = self.alpha
+                self.centroids[i] = (previous[0] + a * (cx - previous[0]), previous[1] + a * (cy - previous[1]))
+
+        # 移出最旧的一帧，放入新的一帧
+        old = self.ring[self.pos]
+        if self.filled == self.history_size:
+            i = 0
+            while old:
+                if old & 1:
+                    self.counts[i] -= 1
+                old >>= 1
+                i += 1
+        else:
+            self.filled += 1
+        self.ring[self.pos] = bits
+        self.pos = (self.pos + 1) % self.history_size
+        i = 0
+        mask = bits
+        while mask:
+            if mask & 1:
+                self.counts[i] += 1
+            mask >>= 1
+            i += 1
+
+        # 迟滞：稳定颜色跌破 exit_count 才释放，新颜色达到 enter_count 才接管
+        if self.stable is not None and self.counts[self.stable] < self.exit_count:
+            self.centroids[self.stable] = None
+            self.stable = None
+        if self.stable is None:
+            best = max(range(len(self.counts)), key=self.counts.__getitem__)
+            if self.counts[best] >= self.enter_count:
+                self.stable = best
+
+        # 长时间未出现的颜色丢弃其平滑质心，下次出现时重新开始
+        for i, count in enumerate(self.counts):
+            if count == 0 and i != self.stable:
+                self.centroids[i] = None
+
+        if self.stable is None or self.centroids[self.stable] is None:
+            return None
+        cx, cy = self.centroids[self.stable]
+        return SmoothedDetection(self.names[self.stable], (int(round(cx)), int(round(cy))),
+                                 self.counts[self.stable] / self.filled)
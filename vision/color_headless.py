@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#无头颜色识别：不打开任何窗口，每帧输出一行JSON检测结果，结束时报告FPS
+#用法: python3 color_headless.py [摄像头编号|视频文件|图片目录] [--color red|all] [--area 5000]
+import sys
+import json
+import time
+import argparse
+import cv2
+
+from camera import ThreadedCapture
+from color_detect import COLORS, ColorContext, ColorEngine, ColorSmoother
+
+
+def detection_to_dict(detection, with_contour=False):
+    x, y, w, h = cv2.boundingRect(detection.contour)
+    result = {'color': detection.color,
+              'centroid': list(detection.centroid),
+              'area': round(detection.area, 1),
+              'bbox': [x, y, w, h]}
+    if with_contour:
+        result['contour'] = detection.contour.reshape(-1, 2).tolist()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='无头颜色识别，结果以JSON行输出到标准输出')
+    parser.add_argument('source', nargs='?', default='0', help='摄像头编号、视频文件或图片目录')
+    parser.add_argument('--color', default='all', choices=['all'] + list(COLORS), help='检测的颜色，all 为全部颜色')
+    parser.add_argument('--area', type=int, default=5000, help='最小轮廓面积')
+    parser.add_argument('--roi', type=int, nargs=4, metavar=('X1', 'Y1', 'X2', 'Y2'), help='只处理该区域')
+    parser.add_argument('--limit', type=int, default=0, help='最多处理的帧数，0为不限制')
+    parser.add_argument('--contours', action='store_true', help='输出中包含完整轮廓点')
+    parser.add_argument('--report-every', type=int, default=100, help='每隔多少帧在标准错误输出上报告一次FPS')
+    args = parser.parse_args()
+
+    engine = ColorEngine(ColorContext(area_threshold=args.area))
+    color = None if args.color == 'all' else args.color
+    smoother = ColorSmoother()
+
+    cap = ThreadedCapture(args.source)
+    if not cap.isOpened():
+        print(f"无法打开: {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    frames = 0
+    start = window_start = time.perf_counter()
+    try:
+        while not args.limit or frames < args.limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            detections = engine.detect(frame, color, args.roi)
+            smoothed = smoother.update(detections)
+            frames += 1
+            record = {'frame': frames,
+                      'timestamp': round(time.time(), 3),
+                      'detections': [detection_to_dict(d, args.contours) for d in detections],
+                      'smoothed': smoothed._asdict() if smoothed is not None else None}
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+            if args.report_every and frames % args.report_every == 0:
+                now = time.perf_counter()
+                print(f"[{frames} 帧] 最近 {args.report_every} 帧 {args.report_every / (now - window_start):.1f} FPS",
+                      file=sys.stderr)
+                window_start = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        cap.release()
+
+    if frames:
+        print(f"共处理 {frames} 帧，平均 {frames / elapsed:.1f} FPS，采集统计: {cap.stats()}", file=sys.stderr)
+        print(engine.timer.report(), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
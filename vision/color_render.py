@@ -0,0 +1,51 @@
+#颜色识别结果的绘制：只在需要显示画面时使用，检测本身见 color_detect.ColorEngine
+import cv2
+
+from color_detect import COLORS, normalize_roi
+
+
+def draw_detections(frame, detections):
+    """画出每个检测结果的轮廓、质心和颜色标签"""
+    for detection in detections:
+        rgb = COLORS[detection.color]['rgb']
+        cx, cy = detection.centroid
+        # 绘制轮廓和中心点
+        cv2.drawContours(frame, [detection.contour], -1, rgb, 2)
+        cv2.circle(frame, (cx, cy), 5, rgb, -1)
+        # 添加颜色标签
+        cv2.putText(frame, f"{detection.color.upper()}", (cx, cy - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, rgb, 2)
+    return frame
+
+
+def draw_smoothed(frame, smoothed):
+    """显示平滑后的稳定颜色、置信度和平滑质心"""
+    rgb = COLORS[smoothed.color]['rgb']
+    cv2.drawMarker(frame, smoothed.centroid, rgb, cv2.MARKER_CROSS, 20, 2)
+    cv2.putText(frame, f"Detected: {smoothed.color.upper()} ({smoothed.confidence:.0%})", (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.8, rgb, 2)
+    return frame
+
+
+def draw_roi(frame, roi):
+    """在输出帧上绘制ROI"""
+    roi = normalize_roi(roi, frame.shape)
+    if roi is not None:
+        x1, y1, x2, y2 = roi
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    return frame
+
+
+def overlay_mask(frame, mask, roi=None):
+    """把掩码画到输出帧上（有ROI时只覆盖ROI区域），返回新的输出帧"""
+    roi = normalize_roi(roi, frame.shape)
+    if roi is not None:
+        x1, y1, x2, y2 = roi
+        frame[y1:y2, x1:x2] = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
+        return frame
+    return cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
+
+
+def draw_status(frame, text, position, color=(255, 255, 255), scale=0.7, thickness=2):
+    cv2.putText(frame, text, position, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    return frame
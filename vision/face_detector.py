@@ -0,0 +1,123 @@
+#人脸检测器：级联分类器只加载一次，之后每帧复用
+import os
+import cv2 as cv
+import numpy as np
+
+# 默认的人脸级联文件，按模块所在目录定位，不依赖当前工作目录
+DEFAULT_CASCADE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'data', 'haarcascade_frontalface_default.xml')
+
+# 预设检测模式
+# accurate: 原始设置，全分辨率、1.02 的金字塔缩放系数
+# fast: 在缩小一半的图像上检测，并优先搜索上一帧人脸附近的区域
+DETECTION_MODES = {
+    'accurate': {'scale': 1.0, 'scale_factor': 1.02, 'min_neighbors': 20, 'track_roi': False},
+    'fast': {'scale': 0.5, 'scale_factor': 1.1, 'min_neighbors': 5, 'track_roi': True},
+}
+
+
+class FaceDetector:
+    """
+    Haar级联人脸检测器
+
+    级联XML在初始化时解析并校验一次，detect()在每帧中直接复用，
+    避免每帧重新读取XML文件
+
+    scale < 1 时在缩小后的灰度图上检测，再把人脸框映射回原分辨率；
+    track_roi 为 True 时，只在上一帧人脸周围（按 roi_margin 扩展）的区域内搜索，
+    区域内没找到人脸或每隔 full_scan_interval 帧时回退到整帧检测
+    """
+
+    def __init__(self, cascade_path=DEFAULT_CASCADE_PATH, scale_factor=1.02, min_neighbors=20,
+                 scale=1.0, track_roi=False, roi_margin=0.5, full_scan_interval=15, min_size=(0, 0)):
+        if not os.path.isfile(cascade_path):
+            raise FileNotFoundError(f"找不到人脸级联文件: {cascade_path}")
+        if not 0 < scale <= 1.0:
+            raise ValueError(f"scale 必须在 (0, 1] 范围内: {scale}")
+
+        self.classifier = cv.CascadeClassifier(cascade_path)
+        if self.classifier.empty():
+            raise RuntimeError(f"人脸级联文件加载失败: {cascade_path}")
+
+        self.cascade_path = cascade_path
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.scale = scale
+        self.track_roi = track_roi
+        self.roi_margin = roi_margin
+        self.full_scan_interval = full_scan_interval
+        self.min_size = min_size
+
+        # ROI预测状态
+        self.last_faces = np.empty((0, 4), dtype=np.int32)
+        self.frames_since_full_scan = 0
+
+    @classmethod
+    def from_mode(cls, mode, **kwargs):
+        """按预设模式名创建检测器，kwargs 可覆盖预设参数"""
+        if mode not in DETECTION_MODES:
+            raise ValueError(f"未知的检测模式: {mode}，可选: {', '.join(DETECTION_MODES)}")
+        params = dict(DETECTION_MODES[mode])
+        params.update(kwargs)
+        return cls(**params)
+
+    def reset(self):
+        """清除ROI预测状态，下一帧做整帧检测"""
+        self.last_faces = np.empty((0, 4), dtype=np.int32)
+        self.frames_since_full_scan = 0
+
+    def _detect_gray(self, gray):
+        """在（可能已缩小的）灰度图上运行级联分类器"""
+        min_size = (int(self.min_size[0] * self.scale), int(self.min_size[1] * self.scale))
+        faces = self.classifier.detectMultiScale(gray, self.scale_factor, self.min_neighbors,
+                                                 minSize=min_size)
+        return np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+    def _predicted_roi(self, width, height):
+        """根据上一帧的人脸位置预测本帧的搜索区域（原分辨率坐标）"""
+        x1 = self.last_faces[:, 0].min()
+        y1 = self.last_faces[:, 1].min()
+        x2 = (self.last_faces[:, 0] + self.last_faces[:, 2]).max()
+        y2 = (self.last_faces[:, 1] + self.last_faces[:, 3]).max()
+        pad_x = int((x2 - x1) * self.roi_margin)
+        pad_y = int((y2 - y1) * self.roi_margin)
+        return (max(0, x1 - pad_x), max(0, y1 - pad_y),
+                min(width, x2 + pad_x), min(height, y2 + pad_y))
+
+    def detect(self, frame):
+        """检测一帧图像中的人脸，返回原分辨率下 N x 4 的 (x, y, w, h) 数组"""
+        if frame.ndim == 2:
+            gray = frame
+        else:
+            gray = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)  # 转化图像为灰度图
+        height, width = gray.shape[:2]
+
+        if self.scale < 1.0:
+            small = cv.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv.INTER_AREA)
+        else:
+            small = gray
+
+        faces = None
+        use_roi = (self.track_roi and len(self.last_faces) > 0
+                   and self.frames_since_full_scan < self.full_scan_interval)
+        if use_roi:
+            x1, y1, x2, y2 = self._predicted_roi(width, height)
+            sx1, sy1 = int(x1 * self.scale), int(y1 * self.scale)
+            sx2, sy2 = int(x2 * self.scale), int(y2 * self.scale)
+            faces = self._detect_gray(small[sy1:sy2, sx1:sx2])
+            if len(faces) > 0:
+                faces[:, 0] += sx1
+                faces[:, 1] += sy1
+                self.frames_since_full_scan += 1
+            else:
+                faces = None  # ROI内丢失目标，回退整帧检测
+
+        if faces is None:
+            faces = self._detect_gray(small)
+            self.frames_since_full_scan = 0
+
+        if self.scale < 1.0 and len(faces) > 0:
+            faces = np.rint(faces / self.scale).astype(np.int32)
+
+        self.last_faces = faces
+        return faces
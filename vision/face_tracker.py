@@ -0,0 +1,119 @@
+#检测+跟踪：每隔N帧运行一次级联检测，中间帧用模板匹配跟踪人脸
+from collections import namedtuple
+import cv2 as cv
+import numpy as np
+
+from face_detector import FaceDetector
+
+# 单帧统计：本帧是否运行了完整级联检测、跟踪置信度（检测帧为1.0）、人脸数量
+FrameStats = namedtuple('FrameStats', ['frame_index', 'cascade_ran', 'confidence', 'num_faces'])
+
+
+class FaceTracker:
+    """
+    检测后跟踪的人脸检测器
+
+    每 detect_interval 帧运行一次完整的级联检测并保存人脸模板；
+    中间帧在上一位置周围 search_margin 扩展的窗口内用 cv.matchTemplate 跟踪。
+    任意人脸的匹配得分低于 min_confidence 时，本帧立即回退到完整检测。
+    只使用OpenCV主模块的函数，不依赖 contrib 里的跟踪器
+    """
+
+    def __init__(self, detector=None, detect_interval=10, min_confidence=0.6,
+                 search_margin=0.5, track_scale=0.5):
+        self.detector = detector if detector is not None else FaceDetector()
+        self.detect_interval = detect_interval
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self.track_scale = track_scale
+
+        self.faces = np.empty((0, 4), dtype=np.int32)
+        self.templates = []
+        self.frames_since_detect = 0
+
+        # 统计信息
+        self.frame_count = 0
+        self.cascade_count = 0
+        self.last_stats = None
+
+    @property
+    def cascade_ratio(self):
+        """运行完整级联检测的帧所占比例"""
+        return self.cascade_count / self.frame_count if self.frame_count else 0.0
+
+    def reset(self):
+        """丢弃当前跟踪目标，下一帧做完整检测"""
+        self.faces = np.empty((0, 4), dtype=np.int32)
+        self.templates = []
+        self.frames_since_detect = 0
+        self.detector.reset()
+
+    def _small_gray(self, frame):
+        gray = frame if frame.ndim == 2 else cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+        if self.track_scale < 1.0:
+            small = cv.resize(gray, None, fx=self.track_scale, fy=self.track_scale,
+                              interpolation=cv.INTER_AREA)
+        else:
+            small = gray
+        return gray, small
+
+    def _update_templates(self, small):
+        """在检测帧上截取每张人脸的模板（跟踪分辨率）"""
+        s = self.track_scale
+        self.templates = []
+        for x, y, w, h in self.faces:
+            tx, ty = int(x * s), int(y * s)
+            tw, th = max(1, int(w * s)), max(1, int(h * s))
+            self.templates.append(small[ty:ty + th, tx:tx + tw].copy())
+
+    def _track(self, small):
+        """在上一位置附近做模板匹配，返回新位置和最低匹配得分"""
+        s = self.track_scale
+        img_h, img_w = small.shape[:2]
+        new_faces = self.faces.copy()
+        min_score = 1.0
+
+        for i, template in enumerate(self.templates):
+            th, tw = template.shape[:2]
+            x, y = int(self.faces[i, 0] * s), int(self.faces[i, 1] * s)
+            pad_x, pad_y = int(tw * self.search_margin) + 1, int(th * self.search_margin) + 1
+            x1, y1 = max(0, x - pad_x), max(0, y - pad_y)
+            x2, y2 = min(img_w, x + tw + pad_x), min(img_h, y + th + pad_y)
+            window = small[y1:y2, x1:x2]
+            if window.shape[0] < th or window.shape[1] < tw:
+                return new_faces, 0.0  # 目标移出画面
+
+            result = cv.matchTemplate(window, template, cv.TM_CCOEFF_NORMED)
+            _, score, _, (mx, my) = cv.minMaxLoc(result)
+            min_score = min(min_score, score)
+            new_faces[i, 0] = int(round((x1 + mx) / s))
+            new_faces[i, 1] = int(round((y1 + my) / s))
+
+        return new_faces, min_score
+
+    def detect(self, frame):
+        """返回本帧人脸框 N x 4 (x, y, w, h)，并更新 last_stats"""
+        gray, small = self._small_gray(frame)
+        cascade_ran = False
+        confidence = 1.0
+
+        if len(self.templates) > 0 and self.frames_since_detect < self.detect_interval:
+            faces, confidence = self._track(small)
+            if confidence >= self.min_confidence:
+                self.faces = faces
+                self.frames_since_detect += 1
+            else:
+                cascade_ran = True  # 跟踪置信度过低，立即重新检测
+        else:
+            cascade_ran = True
+
+        if cascade_ran:
+            self.faces = self.detector.detect(gray)
+            self._update_templates(small)
+            self.frames_since_detect = 0
+            self.cascade_count += 1
+            confidence = 1.0
+
+        self.frame_count += 1
+        self.last_stats = FrameStats(self.frame_count, cascade_ran, confidence, len(self.faces))
+        return self.faces
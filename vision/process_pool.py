@@ -0,0 +1,173 @@
+#多进程检测后端：帧通过共享内存传给工作进程，不做pickle序列化，结果按帧顺序返回
+import queue
+import multiprocessing as mp
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def face_detector_factory(mode='accurate'):
+    """在工作进程中创建人脸检测器，需要其他模式时用 functools.partial 传入 mode"""
+    from face_detector import FaceDetector
+    return FaceDetector.from_mode(mode).detect
+
+
+def color_detector_factory(color=None):
+    """在工作进程中创建颜色检测引擎，color 为 None 时检测全部颜色"""
+    from color_detect import ColorEngine
+    engine = ColorEngine()
+
+    def detect(frame):
+        return engine.detect(frame, color)
+    return detect
+
+
+def tag_detector_factory():
+    """在工作进程中创建apriltag检测器，输入可以是BGR或灰度图"""
+    import cv2
+    from tag_recognition.detect import create_detector, detect_tags
+    detector = create_detector()
+
+    def detect(frame):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return detect_tags(detector, gray)
+    return detect
+
+
+def _worker(factory, shm_names, task_queue, result_queue):
+    """工作进程：从共享内存槽位读帧、检测、把结果和槽位号送回主进程"""
+    shms = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    try:
+        detect = factory()
+    except Exception as e:
+        # 序号 -1 表示检测器没能创建，主进程收到后报错，而不是一直等结果
+        result_queue.put((-1, None, None, repr(e)))
+        for shm in shms:
+            shm.close()
+        return
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        seq, slot, shape, dtype = task
+        frame = np.ndarray(shape, dtype=dtype, buffer=shms[slot].buf)
+        try:
+            result, error = detect(frame), None
+        except Exception as e:
+            result, error = None, repr(e)
+        del frame  # 释放对共享内存的引用后才能关闭
+        result_queue.put((seq, slot, result, error))
+    for shm in shms:
+        shm.close()
+
+
+class ProcessDetectorPool:
+    """
+    基于进程池的检测器
+
+    主进程预先创建 slots 个共享内存槽位，每个能放下一帧 frame_shape 的图像。
+    submit() 把帧复制进空闲槽位，只把 (序号, 槽位, 形状, dtype) 放进任务队列；
+    工作进程直接在共享内存上构造NumPy数组做检测。factory 必须是模块级函数（或它的
+    functools.partial），在每个工作进程中调用一次来创建检测函数。get()/map() 按提交顺序返回结果。
+    检测器创建失败或工作进程意外退出时，等待结果的调用抛出 RuntimeError 而不是一直阻塞
+    """
+
+    def __init__(self, factory, frame_shape, dtype=np.uint8, workers=None, slots=None):
+        self.workers = workers or max(1, mp.cpu_count())
+        slots = slots or self.workers * 2
+        self.slot_size = int(np.prod(frame_shape)) * np.dtype(dtype).itemsize
+        self.shms = [shared_memory.SharedMemory(create=True, size=self.slot_size) for _ in range(slots)]
+        self.free = deque(range(slots))
+
+        self.task_queue = mp.Queue()
+        self.result_queue = mp.Queue()
+        names = [shm.name for shm in self.shms]
+        self.procs = [mp.Process(target=_worker, args=(factory, names, self.task_queue, self.result_queue),
+                                 daemon=True)
+                      for _ in range(self.workers)]
+        for proc in self.procs:
+            proc.start()
+
+        self.next_seq = 0      # 下一个提交的帧序号
+        self.next_out = 0      # 下一个要返回的帧序号
+        self.finished = {}     # 已完成但还没轮到返回的结果：序号 -> (结果, 错误)
+        self.closed = False
+
+    def _collect(self, poll_interval=0.5):
+        """等待一个结果并回收它占用的槽位；期间定期检查工作进程是否还活着"""
+        while True:
+            try:
+                seq, slot, result, error = self.result_queue.get(timeout=poll_interval)
+                break
+            except queue.Empty:
+                dead = [proc for proc in self.procs if not proc.is_alive()]
+                if dead:
+                    codes = ', '.join(str(proc.exitcode) for proc in dead)
+                    raise RuntimeError(f"{len(dead)} 个工作进程已退出（退出码 {codes}），结果不会再返回")
+        if seq < 0:
+            raise RuntimeError(f"工作进程创建检测器失败: {error}")
+        self.free.append(slot)
+        self.finished[seq] = (result, error)
+
+    def submit(self, frame):
+        """提交一帧，返回它的序号；没有空闲槽位时先等待一个结果"""
+        if frame.nbytes > self.slot_size:
+            raise ValueError(f"帧大小 {frame.shape} 超出共享内存槽位（{self.slot_size} 字节）")
+        while not self.free:
+            self._collect()
+        slot = self.free.popleft()
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shms[slot].buf)
+        np.copyto(view, frame)
+        del view
+        seq = self.next_seq
+        self.task_queue.put((seq, slot, frame.shape, frame.dtype.str))
+        self.next_seq += 1
+        return seq
+
+    def pending(self):
+        """已提交但还没返回的帧数"""
+        return self.next_seq - self.next_out
+
+    def _pop(self):
+        result, error = self.finished.pop(self.next_out)
+        self.next_out += 1
+        if error is not None:
+            raise RuntimeError(f"工作进程检测出错: {error}")
+        return result
+
+    def get(self):
+        """按提交顺序返回下一帧的结果（阻塞）"""
+        if self.next_out >= self.next_seq:
+            raise RuntimeError("没有待返回的结果")
+        while self.next_out not in self.finished:
+            self._collect()
+        return self._pop()
+
+    def map(self, frames):
+        """流水线处理帧序列，按输入顺序逐个产出结果"""
+        for frame in frames:
+            self.submit(frame)
+            while self.next_out in self.finished:
+                yield self._pop()
+        while self.pending():
+            yield self.get()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.procs:
+            self.task_queue.put(None)
+        for proc in self.procs:
+            proc.join(timeout=5.0)
+            if proc.is_alive():
+                proc.terminate()
+        for shm in self.shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
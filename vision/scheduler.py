@@ -0,0 +1,118 @@
+#自适应跳帧调度：按每帧处理预算决定本帧运行哪些检测器，超时的旧帧直接丢弃
+import time
+from contextlib import contextmanager
+
+
+class _DetectorSlot:
+    def __init__(self, name, interval, max_skip):
+        self.name = name
+        self.interval = interval    # 至少每隔多少帧才运行一次
+        self.max_skip = max_skip    # 最多连续跳过多少帧，防止重型检测器饿死
+        self.cost = None            # 处理耗时的指数平均（秒）
+        self.since_run = interval   # 距上次运行的帧数，初始即可运行
+        self.runs = 0
+        self.skipped = 0
+
+
+class FrameScheduler:
+    """
+    视觉循环共用的跳帧调度器
+
+    每帧的处理预算为 1/target_fps（未指定时为 max_latency）。begin_frame() 丢弃采集时间
+    距今超过 max_latency 的帧；due() 按“距上次运行帧数/interval”从大到小挑选检测器，
+    只要估计耗时还放得进剩余预算就运行，否则本帧跳过该检测器。
+    轻量检测器因此几乎每帧运行，重型检测器自动隔帧运行，连续跳过 max_skip 帧后强制运行一次
+    """
+
+    def __init__(self, target_fps=None, max_latency=0.2, alpha=0.2):
+        self.target_fps = target_fps
+        self.max_latency = max_latency
+        self.alpha = alpha
+        self.budget = 1.0 / target_fps if target_fps else max_latency
+        self.slots = {}
+
+        self.remaining = self.budget
+        self.frame_start = 0.0
+
+        # 统计信息
+        self.frames = 0
+        self.processed = 0
+        self.dropped = 0
+
+    def add(self, name, interval=1, max_skip=10):
+        """注册检测器：interval 为基础运行间隔（帧），重型检测器可设得更大"""
+        self.slots[name] = _DetectorSlot(name, interval, max(interval, max_skip))
+        return self
+
+    def begin_frame(self, frame_time=None):
+        """
+        开始处理一帧，frame_time 为采集时刻（time.perf_counter()）
+
+        帧已经过期（超过 max_latency）时返回 False，调用方应丢弃该帧
+        """
+        self.frames += 1
+        now = time.perf_counter()
+        if frame_time is not None and now - frame_time > self.max_latency:
+            self.dropped += 1
+            for slot in self.slots.values():
+                slot.since_run += 1
+            return False
+        self.frame_start = now
+        # 已经等待的时间也计入本帧的延迟预算
+        waited = now - frame_time if frame_time is not None else 0.0
+        self.remaining = max(0.0, self.budget - waited) if not self.target_fps else self.budget
+        self.processed += 1
+        return True
+
+    def due(self):
+        """返回本帧应该运行的检测器名称列表，未入选的检测器记为跳过"""
+        for slot in self.slots.values():
+            slot.since_run += 1
+        ready = [s for s in self.slots.values() if s.since_run >= s.interval]
+        ready.sort(key=lambda s: s.since_run / s.interval, reverse=True)
+
+        chosen = []
+        remaining = self.remaining
+        for slot in ready:
+            cost = slot.cost or 0.0
+            if cost <= remaining or slot.since_run > slot.max_skip:
+                chosen.append(slot.name)
+                remaining -= cost
+            else:
+                slot.skipped += 1
+        for slot in self.slots.values():
+            if slot.since_run < slot.interval:
+                slot.skipped += 1
+        return chosen
+
+    def should_run(self, name):
+        """只有一个检测器时的简便写法"""
+        return name in self.due()
+
+    def record(self, name, seconds):
+        """记录检测器本次运行耗时"""
+        slot = self.slots[name]
+        slot.cost = seconds if slot.cost is None else slot.cost + self.alpha * (seconds - slot.cost)
+        slot.since_run = 0
+        slot.runs += 1
+        self.remaining -= seconds
+
+    @contextmanager
+    def timed(self, name):
+        """with scheduler.timed('face'): ... 运行检测器并记录耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def stats(self):
+        """返回整体和各检测器的计数：processed/dropped 为帧数，runs/skipped 为检测器运行/跳过次数"""
+        return {
+            'frames': self.frames,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'detectors': {name: {'runs': s.runs, 'skipped': s.skipped,
+                                 'cost_ms': round((s.cost or 0.0) * 1000, 2)}
+                          for name, s in self.slots.items()},
+        }
@@ -0,0 +1,36 @@
+"""
+apriltag标签识别
+
+导入本包不会加载 OpenCV、apriltag 或 RPi.GPIO，
+这些库在第一次用到对应的类或函数时才导入：
+
+    from tag_recognition import TagRecognizer
+    recognizer = TagRecognizer(feedback=False)
+    tags = recognizer.detect(frame)
+"""
+import importlib
+
+# 公开名称 -> 所在子模块，按需导入
+_EXPORTS = {
+    'TagRecognizer': 'recognizer',
+    'TAG_DTYPE': 'detect',
+    'EMPTY_TAGS': 'detect',
+    'TagTracker': 'detect',
+    'create_detector': 'detect',
+    'detect_tags': 'detect',
+    'detections_to_array': 'detect',
+    'BuzzerWorker': 'buzzer',
+    'GPIOBuzzerBackend': 'buzzer',
+    'MockBuzzerBackend': 'buzzer',
+    'create_backend': 'buzzer',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
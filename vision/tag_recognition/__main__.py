@@ -0,0 +1,56 @@
+#无头标签识别：处理视频文件或图片目录并输出吞吐量
+#用法（在 vision 目录下）: python3 -m tag_recognition 视频或图片目录 [--fast] [--roi] [--buzzer] [--verbose]
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python3 -m tag_recognition', description='无头apriltag识别与吞吐量统计')
+    parser.add_argument('source', help='视频文件、图片目录或摄像头编号')
+    parser.add_argument('--fast', action='store_true', help='在降采样图像上检测')
+    parser.add_argument('--roi', action='store_true', help='降采样+ROI跟踪，更快但会漏掉新出现的标签')
+    parser.add_argument('--buzzer', action='store_true', help='启用蜂鸣器反馈（默认关闭）')
+    parser.add_argument('--limit', type=int, default=0, help='最多处理的帧数，0为不限制')
+    parser.add_argument('--verbose', action='store_true', help='逐帧打印检测到的标签')
+    args = parser.parse_args()
+
+    from camera import ThreadedCapture
+    from .recognizer import TagRecognizer
+
+    recognizer = TagRecognizer(use_roi=args.roi, feedback=args.buzzer, decimate=args.fast)
+    cap = ThreadedCapture(args.source)
+    if not cap.isOpened():
+        print(f"无法打开: {args.source}")
+        return
+
+    frames = 0
+    total_tags = 0
+    detect_time = 0.0
+    start = time.perf_counter()
+    while not args.limit or frames < args.limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        t0 = time.perf_counter()
+        tags = recognizer.detect(frame, draw=False)
+        recognizer.update_feedback(tags)
+        detect_time += time.perf_counter() - t0
+        frames += 1
+        total_tags += len(tags)
+        if args.verbose:
+            ids = ', '.join(f"{f}:{i}" for f, i in zip(tags['family'], tags['id']))
+            print(f"帧 {frames}: {ids or '无'}")
+    elapsed = time.perf_counter() - start
+    cap.release()
+    recognizer.close()
+
+    if frames == 0:
+        print("没有读取到任何帧")
+        return
+    print(f"处理帧数: {frames} | 标签总数: {total_tags} | 总耗时: {elapsed:.2f} s")
+    print(f"端到端吞吐量: {frames / elapsed:.1f} FPS | 检测耗时: {detect_time / frames * 1000:.2f} ms/帧 | "
+          f"检测吞吐量: {frames / detect_time:.1f} FPS, {total_tags / detect_time:.1f} 标签/秒")
+
+
+if __name__ == '__main__':
+    main()
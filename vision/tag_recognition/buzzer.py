@@ -0,0 +1,117 @@
+#蜂鸣器反馈：在独立的工作线程里播放蜂鸣模式，不阻塞检测循环
+import time
+import queue
+import threading
+
+BUZZER_PIN = 6  # 蜂鸣器所在的BCM引脚
+
+
+class GPIOBuzzerBackend:
+    """通过 RPi.GPIO 驱动蜂鸣器，RPi.GPIO 在创建时才导入"""
+
+    def __init__(self, pin=BUZZER_PIN):
+        import RPi.GPIO as GPIO
+        self.GPIO = GPIO
+        self.pin = pin
+        GPIO.setwarnings(False)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.OUT)  # 设置引脚为输出模式
+
+    def on(self):
+        self.GPIO.output(self.pin, 1)  # 设置引脚输出高电平
+
+    def off(self):
+        self.GPIO.output(self.pin, 0)
+
+    def close(self):
+        self.off()
+        self.GPIO.cleanup(self.pin)
+
+
+class MockBuzzerBackend:
+    """没有GPIO的机器上使用的模拟蜂鸣器，记录每次开关的时间"""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.events = []
+
+    def on(self):
+        self.events.append((time.monotonic(), 1))
+        if self.verbose:
+            print("🔔 蜂鸣器: 开")
+
+    def off(self):
+        self.events.append((time.monotonic(), 0))
+        if self.verbose:
+            print("🔕 蜂鸣器: 关")
+
+    def close(self):
+        pass
+
+
+def create_backend(use_gpio=True, pin=BUZZER_PIN):
+    """优先使用GPIO蜂鸣器，导入或初始化失败时退回模拟蜂鸣器"""
+    if use_gpio:
+        try:
+            return GPIOBuzzerBackend(pin)
+        except (ImportError, RuntimeError) as e:
+            print(f"⚠️ 无法使用GPIO蜂鸣器({e})，改用模拟蜂鸣器")
+    return MockBuzzerBackend()
+
+
+class BuzzerWorker:
+    """
+    蜂鸣器工作线程
+
+    beep()/play() 只把蜂鸣模式放入队列就立即返回，由后台线程负责开关和延时。
+    同一个模式在 debounce 秒内重复请求（例如标签在画面边缘闪烁）会被忽略
+    """
+
+    def __init__(self, backend=None, debounce=1.0, max_pending=4):
+        self.backend = backend if backend is not None else create_backend()
+        self.debounce = debounce
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.last_request = {}  # 模式 -> 上次接受请求的时间
+        self.dropped_count = 0
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def play(self, pattern):
+        """
+        播放蜂鸣模式，pattern 为 ((响的秒数, 停的秒数), ...) 元组
+
+        返回是否已加入队列（被防抖或队列已满时返回 False）
+        """
+        pattern = tuple(pattern)
+        now = time.monotonic()
+        last = self.last_request.get(pattern)
+        if last is not None and now - last < self.debounce:
+            return False
+        try:
+            self.queue.put_nowait(pattern)
+        except queue.Full:
+            self.dropped_count += 1
+            return False
+        self.last_request[pattern] = now
+        return True
+
+    def beep(self, count, on_time=0.2, off_time=0.5):
+        """连续响 count 声"""
+        return self.play(((on_time, off_time),) * count)
+
+    def _worker(self):
+        while True:
+            pattern = self.queue.get()
+            if pattern is None:
+                break
+            for on_time, off_time in pattern:
+                self.backend.on()
+                time.sleep(on_time)
+                self.backend.off()
+                time.sleep(off_time)
+
+    def close(self):
+        """等待已排队的模式播放完后停止工作线程并释放蜂鸣器"""
+        self.queue.put(None)
+        self.thread.join()
+        self.backend.close()
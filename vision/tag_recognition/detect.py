@@ -0,0 +1,162 @@
+#apriltag检测结果：一帧内所有标签打包成一个NumPy结构化数组
+import cv2
+import numpy as np
+
+# 每个标签一条记录：家族、编号、四个角点、中心点、旋转角（度）、解码余量
+TAG_DTYPE = np.dtype([
+    ('family', 'U16'),
+    ('id', np.int32),
+    ('corners', np.float32, (4, 2)),
+    ('center', np.float32, (2,)),
+    ('angle', np.float32),
+    ('decision_margin', np.float32),
+])
+
+EMPTY_TAGS = np.empty(0, dtype=TAG_DTYPE)
+
+
+def detections_to_array(detections, offset=(0.0, 0.0), scale=1.0):
+    """
+    把 apriltag.Detector.detect() 的结果转换为 TAG_DTYPE 结构化数组
+
+    所有标签的角点先堆叠成 N x 4 x 2 数组，坐标映射和旋转角对整个数组向量化计算；
+    scale/offset 用于把缩小图像或ROI中的坐标映射回原图
+    """
+    n = len(detections)
+    if n == 0:
+        return EMPTY_TAGS
+
+    # 先把各字段收集成数组，每个字段只整体写入一次
+    corners = np.array([d.corners for d in detections], dtype=np.float32).reshape(n, 4, 2)
+    centers = np.array([d.center for d in detections], dtype=np.float32).reshape(n, 2)
+    families = [d.tag_family for d in detections]
+
+    tags = np.empty(n, dtype=TAG_DTYPE)
+    tags['id'] = [d.tag_id for d in detections]
+    tags['decision_margin'] = [d.decision_margin for d in detections]
+    tags['family'] = [f.decode('utf-8') if isinstance(f, bytes) else f for f in families]
+
+    offset = np.asarray(offset, dtype=np.float32)
+    if scale != 1.0:
+        corners /= scale
+        centers /= scale
+    corners += offset
+    centers += offset
+    tags['corners'] = corners
+    tags['center'] = centers
+
+    # 旋转角：第0个角点相对第1个角点的方向
+    edge = corners[:, 0] - corners[:, 1]
+    tags['angle'] = np.degrees(np.arctan2(edge[:, 1], edge[:, 0]))
+    return tags
+
+
+def create_detector():
+    """创建apriltag检测器，apriltag库在这里才导入"""
+    import apriltag
+    return apriltag.Detector(searchpath=apriltag._get_demo_searchpath())
+
+
+def detect_tags(detector, gray):
+    """检测灰度图中的全部apriltag"""
+    return detections_to_array(detector.detect(gray, return_image=False))
+
+
+class TagTracker:
+    """
+    降采样（+ 可选ROI）的apriltag检测
+
+    每次检测都在按 decimate 缩小后的图像上进行。full_scan_interval > 0 时启用ROI跟踪：
+    整帧扫描之后的帧只在上次标签位置按 roi_padding 扩展后的区域内检测（区域同样降采样），
+    距上次整帧扫描已满 full_scan_interval 帧、或ROI内找到的标签比上次少时回退到整帧扫描。
+
+    默认只降采样、每帧整帧扫描：bench_tag_modes.py 的合成移动序列上，降采样+ROI
+    每帧耗时约为仅降采样的一半，但ROI扫描找不到两次整帧扫描之间新出现的标签，
+    命中率低于仅降采样。只有耗时比漏检更要紧、且在实际序列上测过命中率时才启用ROI
+    """
+
+    def __init__(self, detector, decimate=2.0, roi_padding=0.5, full_scan_interval=0):
+        self.detector = detector
+        self.decimate = decimate
+        self.roi_padding = roi_padding
+        self.full_scan_interval = full_scan_interval
+
+        self.last_tags = EMPTY_TAGS
+        self.frames_since_full_scan = 0
+
+        # 统计信息
+        self.full_scan_count = 0
+        self.roi_scan_count = 0
+
+    def reset(self):
+        self.last_tags = EMPTY_TAGS
+        self.frames_since_full_scan = 0
+
+    def _detect_region(self, region, offset=(0, 0)):
+        """按 decimate 缩小区域后检测，坐标映射回原图"""
+        if self.decimate > 1.0:
+            scale = 1.0 / self.decimate
+            region = cv2.resize(region, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+        detections = self.detector.detect(np.ascontiguousarray(region), return_image=False)
+        return detections_to_array(detections, offset=offset, scale=scale)
+
+    def _full_scan(self, gray):
+        tags = self._detect_region(gray)
+        self.full_scan_count += 1
+        self.frames_since_full_scan = 0
+        return tags
+
+    def _predicted_rois(self, width, height):
+        """每个上次出现的标签一个 (x1, y1, x2, y2) 搜索区域，重叠的区域合并"""
+        lo = self.last_tags['corners'].min(axis=1)
+        hi = self.last_tags['corners'].max(axis=1)
+        pad = (hi - lo) * self.roi_padding
+        lo = np.maximum(lo - pad, 0).astype(np.int32)
+        hi = np.minimum(hi + pad, (width, height)).astype(np.int32)
+
+        # 反复合并相交的区域，直到没有任何两个区域重叠（合并后的大区域可能又碰到别的区域）
+        rois = [tuple(box) for box in np.hstack([lo, hi]).tolist()]
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(rois)):
+                for j in range(i + 1, len(rois)):
+                    ax1, ay1, ax2, ay2 = rois[i]
+                    bx1, by1, bx2, by2 = rois[j]
+                    if ax1 <= bx2 and bx1 <= ax2 and ay1 <= by2 and by1 <= ay2:
+                        rois[i] = (min(ax1, bx1), min(ay1, by1), max(ax2, bx2), max(ay2, by2))
+                        del rois[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return rois
+
+    def _roi_scan(self, gray):
+        height, width = gray.shape[:2]
+        found = []
+        for x1, y1, x2, y2 in self._predicted_rois(width, height):
+            tags = self._detect_region(gray[y1:y2, x1:x2], (x1, y1))
+            if len(tags):
+                found.append(tags)
+        self.roi_scan_count += 1
+        self.frames_since_full_scan += 1
+        return np.concatenate(found) if found else EMPTY_TAGS
+
+    def detect(self, gray):
+        """检测灰度图中的apriltag，返回 TAG_DTYPE 结构化数组"""
+        tags = None
+        if len(self.last_tags) > 0 and self.frames_since_full_scan < self.full_scan_interval:
+            tags = self._roi_scan(gray)
+            if len(tags) < len(self.last_tags):
+                tags = None  # 有标签丢失，回退整帧扫描
+        if tags is None:
+            tags = self._full_scan(gray)
+            if len(tags) < len(self.last_tags):
+                # 整帧扫描也少了标签（可能是降采样漏检），下一帧再整帧扫描一次，
+                # 否则之后的ROI扫描要等到下一次定期整帧扫描才会重新找回它
+                self.frames_since_full_scan = self.full_scan_interval
+        self.last_tags = tags
+        return tags
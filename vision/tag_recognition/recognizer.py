@@ -0,0 +1,94 @@
+#标签识别：检测、画框、蜂鸣反馈
+import cv2
+import numpy as np
+
+from .detect import create_detector, detect_tags, TagTracker
+
+
+class TagRecognizer:
+    """
+    apriltag标签识别器
+
+    apriltag检测器在第一次检测时才创建，蜂鸣器在第一次需要反馈时才创建；
+    feedback=False 时完全不碰GPIO，适合无头运行和基准测试。
+    decimate=True 时在降采样图像上检测，use_roi=True 时再加上ROI跟踪（见 TagTracker）
+    """
+
+    def __init__(self, use_roi=False, feedback=True, buzzer=None, decimate=False, roi_interval=10):
+        self.use_roi = use_roi
+        self.decimate = decimate or use_roi
+        self.roi_interval = roi_interval
+        self.feedback = feedback
+        self.detector = None
+        self.tracker = None
+        self.buzzer = buzzer
+        self.state = True  # 标签离开画面后才允许再次蜂鸣
+
+    def _ensure_detector(self):
+        if self.detector is None:
+            self.detector = create_detector()
+            if self.decimate:
+                self.tracker = TagTracker(self.detector,
+                                          full_scan_interval=self.roi_interval if self.use_roi else 0)
+
+    def detect_gray(self, gray):
+        """检测灰度图中的全部标签，返回 TAG_DTYPE 结构化数组"""
+        self._ensure_detector()
+        if self.tracker is not None:
+            return self.tracker.detect(gray)
+        return detect_tags(self.detector, gray)
+
+    def detect(self, img, draw=True):
+        """检测（并画出）画面中的全部标签，返回 TAG_DTYPE 结构化数组（家族、编号、角点、中心、旋转角、解码余量）"""
+        tags = self.detect_gray(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+        if draw and len(tags) != 0:
+            corners = np.rint(tags['corners']).astype(np.int32)  # 所有标签的四个角点
+            cv2.polylines(img, list(corners), True, (0, 255, 255), 2)
+        return tags
+
+    def _beep(self, tag_id):
+        if not self.feedback or tag_id not in (1, 2, 3):
+            return
+        if self.buzzer is None:
+            from .buzzer import BuzzerWorker
+            self.buzzer = BuzzerWorker()
+        self.buzzer.beep(tag_id)  # 标签几号就响几声
+
+    def update_feedback(self, tags):
+        """根据检测结果触发蜂鸣：以第一个标签为准，标签离开画面前只响一次"""
+        if len(tags) != 0:
+            if self.state:
+                self._beep(int(tags['id'][0]))
+                self.state = False
+        else:
+            self.state = True
+
+    def run(self, img):
+        """检测标签、触发蜂鸣反馈并在图像上标注结果"""
+        tags = self.detect(img, draw=False)
+        self.update_feedback(tags)
+        return self.draw(img, tags)
+
+    def draw(self, img, tags):
+        """在图像上画出标签框、编号、旋转角和家族（tags 可以是之前某帧的检测结果）"""
+        if len(tags) != 0:
+            corners = np.rint(tags['corners']).astype(np.int32)  # 所有标签的四个角点
+            cv2.polylines(img, list(corners), True, (0, 255, 255), 2)
+            # 画面上显示全部标签
+            tag_family = tags['family'][0]
+            for tag in tags:
+                cx, cy = int(tag['center'][0]), int(tag['center'][1])
+                cv2.putText(img, f"{tag['id']} {tag['angle']:.0f}deg", (cx, cy), cv2.FONT_HERSHEY_SIMPLEX, 0.5, [0, 255, 255], 1)
+            cv2.putText(img, "tag_id: " + ", ".join(str(i) for i in tags['id']), (10, img.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
+            cv2.putText(img, "tag_family: " + tag_family, (10, img.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
+        else:
+            cv2.putText(img, "tag_id: None", (10, img.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
+            cv2.putText(img, "tag_family: None", (10, img.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.65, [0, 255, 255], 2)
+
+        return img
+
+    def close(self):
+        """等待蜂鸣器播放完毕并释放GPIO"""
+        if self.buzzer is not None:
+            self.buzzer.close()
+            self.buzzer = None
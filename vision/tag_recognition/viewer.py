@@ -0,0 +1,44 @@
+#标签识别的窗口界面：摄像头画面 + 标注结果，按ESC退出
+import sys
+import time
+import cv2
+
+from .recognizer import TagRecognizer
+
+
+def main(argv=None):
+    """用法: [摄像头编号|视频文件|图片目录] [--fast] [--roi]"""
+    from camera import ThreadedCapture
+    from scheduler import FrameScheduler
+
+    argv = sys.argv[1:] if argv is None else argv
+    args = [a for a in argv if not a.startswith('--')]
+    recognizer = TagRecognizer(use_roi='--roi' in argv, decimate='--fast' in argv)
+    cap = ThreadedCapture(args[0] if args else 0) #读取摄像头
+    # 跳帧调度：处理跟不上时隔帧检测并丢弃过期帧，跳过的帧画上一次的检测结果
+    scheduler = FrameScheduler(max_latency=0.2).add('tag')
+    tags = None
+
+    while True:
+        ret, img = cap.read()
+        if ret:
+            # 逐帧回放的文件不会积压，不按延迟丢帧
+            fresh = scheduler.begin_frame(None if cap.lockstep else cap.frame_time)
+            if fresh and (scheduler.should_run('tag') or tags is None):
+                with scheduler.timed('tag'):
+                    tags = recognizer.detect(img, draw=False)
+                    recognizer.update_feedback(tags)
+            Frame = recognizer.draw(img.copy(), tags) if tags is not None else img
+            cv2.imshow('Frame', Frame)
+            key = cv2.waitKey(1)
+            if key == 27:
+                break
+        elif cap.finished:
+            break
+        else:
+            time.sleep(0.01)
+    print(cap.stats())
+    print(scheduler.stats())
+    cap.release()
+    recognizer.close()
+    cv2.destroyAllWindows()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+#视觉服务：一个摄像头只采集一次，人脸/颜色/apriltag检测在线程池中并行运行
+#OpenCV 的函数在计算时会释放GIL，所以多线程可以真正并行；--backend process 时每个检测器在独立进程中运行
+#用法: python3 vision_service.py [摄像头编号|视频文件|图片目录] [--detectors face color tag] [--backend thread|process] [--json]
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+
+from camera import ThreadedCapture
+
+# 一帧的合并结果：帧序号、采集时刻（time.time()）、各检测器结果、各检测器耗时（毫秒）、整帧耗时（毫秒）
+FrameResult = namedtuple('FrameResult', ['frame_id', 'timestamp', 'results', 'latency_ms', 'total_ms'])
+
+
+class SharedFrame:
+    """
+    多个检测器共享的一帧
+
+    灰度图和HSV图在第一次被访问时计算，之后所有检测器复用同一份；
+    加锁保证并发访问时只计算一次
+    """
+
+    def __init__(self, frame, frame_id=0, timestamp=None):
+        self.frame = frame
+        self.frame_id = frame_id
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._gray = None
+        self._hsv = None
+        self._gray_lock = threading.Lock()
+        self._hsv_lock = threading.Lock()
+
+    @property
+    def gray(self):
+        with self._gray_lock:
+            if self._gray is None:
+                self._gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+            return self._gray
+
+    @property
+    def hsv(self):
+        with self._hsv_lock:
+            if self._hsv is None:
+                self._hsv = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV)
+            return self._hsv
+
+
+def face_to_json(faces):
+    return faces.tolist()
+
+
+def color_to_json(detections):
+    return [{'color': d.color, 'centroid': list(d.centroid), 'area': d.area} for d in detections]
+
+
+def tags_to_json(tags):
+    return [{'family': str(t['family']), 'id': int(t['id']),
+             'center': [round(float(v), 1) for v in t['center']], 'angle': round(float(t['angle']), 1)}
+            for t in tags]
+
+
+def face_job(detector=None):
+    """人脸检测任务，返回 [[x, y, w, h], ...]"""
+    if detector is None:
+        from face_detector import FaceDetector
+        detector = FaceDetector.from_mode('fast')
+
+    def run(shared):
+        return face_to_json(detector.detect(shared.gray))
+    return run
+
+
+def color_job(engine=None, color=None):
+    """颜色检测任务（color 为 None 时检测全部颜色），返回 [{'color', 'centroid', 'area'}, ...]"""
+    if engine is None:
+        from color_detect import ColorEngine
+        engine = ColorEngine()
+
+    def run(shared):
+        return color_to_json(engine.detect(shared.frame, color, hsv=shared.hsv))
+    return run
+
+
+def tag_job(recognizer=None):
+    """apriltag检测任务，返回 [{'family', 'id', 'center', 'angle'}, ...]"""
+    if recognizer is None:
+        from tag_recognition import TagRecognizer
+        recognizer = TagRecognizer(feedback=False)
+
+    def run(shared):
+        return tags_to_json(recognizer.detect_gray(shared.gray))
+    return run
+
+
+DETECTOR_FACTORIES = {'face': face_job, 'color': color_job, 'tag': tag_job}
+
+
+def process_job(factory, to_json):
+    """
+    在独立工作进程中运行检测器的任务，帧经共享内存传过去（见 process_pool.ProcessDetectorPool）
+
+    factory 在工作进程里创建检测函数；进程池在第一帧到来时按帧尺寸创建，每个检测器一个进程，
+    有状态的检测器因此仍按帧顺序运行。工作进程拿到的是原始BGR帧，灰度/HSV图不与其他检测器共享
+    """
+    state = {}
+
+    def run(shared):
+        pool = state.get('pool')
+        if pool is None:
+            from process_pool import ProcessDetectorPool
+            pool = state['pool'] = ProcessDetectorPool(factory, shared.frame.shape, shared.frame.dtype,
+                                                       workers=1, slots=1)
+        pool.submit(shared.frame)
+        return to_json(pool.get())
+
+    def close():
+        if 'pool' in state:
+            state.pop('pool').close()
+
+    run.close = close
+    return run
+
+
+def process_jobs(names):
+    """--backend process 用的任务表，检测器设置与 DETECTOR_FACTORIES 相同"""
+    from functools import partial
+    import process_pool
+    factories = {
+        'face': (partial(process_pool.face_detector_factory, 'fast'), face_to_json),
+        'color': (process_pool.color_detector_factory, color_to_json),
+        'tag': (process_pool.tag_detector_factory, tags_to_json),
+    }
+    return {name: process_job(*factories[name]) for name in names}
+
+
+class VisionService:
+    """
+    共享一个帧源的多检测器视觉服务
+
+    jobs 为 {名称: 函数(SharedFrame) -> 结果}。每帧把所有检测器提交到线程池，
+    等全部完成后合并为一个 FrameResult。同一个检测器同一时刻只在一个线程中运行，
+    因此有状态的检测器（ROI预测、跟踪）不需要额外加锁。
+    给定 scheduler（FrameScheduler）时按它的预算决定每帧运行哪些检测器
+    """
+
+    def __init__(self, jobs, workers=None, scheduler=None):
+        self.jobs = dict(jobs)
+        self.pool = ThreadPoolExecutor(max_workers=workers or len(self.jobs))
+        self.scheduler = scheduler
+        if scheduler is not None:
+            for name in self.jobs:
+                if name not in scheduler.slots:
+                    scheduler.add(name)
+        self.frame_count = 0
+
+    @staticmethod
+    def _timed(job, shared):
+        start = time.perf_counter()
+        result = job(shared)
+        return result, (time.perf_counter() - start) * 1000.0
+
+    def process(self, frame, timestamp=None):
+        """并行运行检测器处理一帧，返回 FrameResult"""
+        self.frame_count += 1
+        start = time.perf_counter()
+        shared = SharedFrame(frame, self.frame_count, timestamp)
+        names = self.scheduler.due() if self.scheduler is not None else list(self.jobs)
+        futures = {name: self.pool.submit(self._timed, self.jobs[name], shared) for name in names}
+
+        results, latency = {}, {}
+        for name, future in futures.items():
+            results[name], latency[name] = future.result()
+            if self.scheduler is not None:
+                self.scheduler.record(name, latency[name] / 1000.0)
+        total = (time.perf_counter() - start) * 1000.0
+        return FrameResult(self.frame_count, shared.timestamp, results, latency, total)
+
+    def run(self, cap, limit=0):
+        """从采集器（ThreadedCapture）读帧并逐帧产出 FrameResult"""
+        while not limit or self.frame_count < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            capture_time = getattr(cap, 'frame_time', None)
+            # 逐帧回放的文件不会积压，不按延迟丢帧
+            stale_time = None if getattr(cap, 'lockstep', False) else capture_time
+            if self.scheduler is not None and not self.scheduler.begin_frame(stale_time):
+                continue
+            # 把采集时刻换算为墙上时间作为结果时间戳
+            timestamp = time.time() - (time.perf_counter() - capture_time) if capture_time else time.time()
+            yield self.process(frame, timestamp)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        for job in self.jobs.values():
+            if hasattr(job, 'close'):
+                job.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='人脸/颜色/apriltag并行检测服务')
+    parser.add_argument('source', nargs='?', default='0', help='摄像头编号、视频文件或图片目录')
+    parser.add_argument('--detectors', nargs='+', default=list(DETECTOR_FACTORIES),
+                        choices=list(DETECTOR_FACTORIES), help='要运行的检测器')
+    parser.add_argument('--workers', type=int, default=0, help='线程数，默认与检测器数量相同')
+    parser.add_argument('--backend', choices=['thread', 'process'], default='thread',
+                        help='thread: 检测器在线程池中运行；process: 每个检测器一个工作进程，帧经共享内存传递')
+    parser.add_argument('--limit', type=int, default=0, help='最多处理的帧数，0为不限制')
+    parser.add_argument('--json', action='store_true', help='每帧输出一行JSON结果')
+    parser.add_argument('--target-fps', type=float, default=0, help='启用跳帧调度的目标帧率，0为每帧运行全部检测器')
+    args = parser.parse_args()
+
+    scheduler = None
+    if args.target_fps:
+        from scheduler import FrameScheduler
+        scheduler = FrameScheduler(target_fps=args.target_fps)
+
+    if args.backend == 'process':
+        jobs = process_jobs(args.detectors)
+    else:
+        jobs = {name: DETECTOR_FACTORIES[name]() for name in args.detectors}
+    service = VisionService(jobs, workers=args.workers or None, scheduler=scheduler)
+    cap = ThreadedCapture(args.source)
+    if not cap.isOpened():
+        print(f"无法打开: {args.source}", file=sys.stderr)
+        sys.exit(1)
+
+    totals = {name: 0.0 for name in jobs}
+    runs = {name: 0 for name in jobs}
+    frames = 0
+    frame_total = 0.0
+    start = time.perf_counter()
+    try:
+        for result in service.run(cap, args.limit):
+            frames += 1
+            frame_total += result.total_ms
+            for name, ms in result.latency_ms.items():
+                totals[name] += ms
+                runs[name] += 1
+            if args.json:
+                sys.stdout.write(json.dumps(result._asdict(), ensure_ascii=False) + '\n')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        cap.release()
+        service.close()
+
+    if frames:
+        print(f"共处理 {frames} 帧，{frames / elapsed:.1f} FPS，平均每帧 {frame_total / frames:.2f} ms", file=sys.stderr)
+        for name in jobs:
+            if runs[name]:
+                print(f"  {name:<6} 运行 {runs[name]} 次，平均 {totals[name] / runs[name]:.2f} ms", file=sys.stderr)
+        print(f"采集统计: {cap.stats()}", file=sys.stderr)
+        if scheduler is not None:
+            print(f"调度统计: {scheduler.stats()}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
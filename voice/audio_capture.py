@@ -0,0 +1,311 @@
+#音频采集：回调模式写入预分配的环形缓冲区，检测在消费者线程中读取
+import threading
+import time
+import wave
+from collections import deque
+import numpy as np
+
+
+def read_wav(path):
+    """读取16bit WAV，多声道只取第一个声道，返回 (int16样本数组, 采样率)"""
+    with wave.open(path, 'rb') as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"只支持16bit WAV: {path}")
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        channels = f.getnchannels()
+        if channels > 1:
+            samples = samples[::channels]
+        return samples, f.getframerate()
+
+
+def lowpass_taps(cutoff, sample_rate, taps=101):
+    """加 Hamming 窗的 sinc 低通 FIR 系数，cutoff 为截止频率（Hz）"""
+    n = np.arange(taps) - (taps - 1) / 2.0
+    h = np.sinc(2.0 * cutoff / sample_rate * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+def resample(samples, src_rate, dst_rate):
+    """
+    线性插值重采样 int16 样本
+
+    降采样前先用截止在新奈奎斯特频率 90% 处的 FIR 低通滤波，
+    避免高频成分折叠到低频（会改变 MFCC 等频谱特征）
+    """
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    signal = np.asarray(samples, dtype=np.float32)
+    if dst_rate < src_rate:
+        # 完整卷积后取居中的一段，输入比滤波器短时长度也不变
+        taps = lowpass_taps(0.45 * dst_rate, src_rate)
+        offset = (len(taps) - 1) // 2
+        signal = np.convolve(signal, taps)[offset:offset + len(signal)]
+    count = int(len(samples) * dst_rate / src_rate)
+    positions = np.arange(count) * (src_rate / dst_rate)
+    resampled = np.interp(positions, np.arange(len(signal)), signal)
+    return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+
+
+class AudioRingBuffer:
+    """
+    单生产者单消费者的 int16 环形缓冲区
+
+    write_pos 只由生产者修改，read_pos 只由消费者修改，都是单调递增的样本计数，取模得到数组下标。
+    双方都是先拷贝数据、再更新自己的位置，所以写入端（PyAudio 回调）不加任何锁；
+    消费者没有数据时按 poll_interval 轮询等待，而不是等条件变量（通知它同样要在回调里加锁）。
+    缓冲区满时丢弃新写入的样本并计为溢出（overflow），丢掉的样本仍然占用音频流时间：
+    read() 返回的起始位置是这块样本在整个音频流（包括丢弃部分）中的序号。
+    消费者等待超时仍凑不够一块样本时计为欠载（underrun）
+    """
+
+    def __init__(self, capacity, poll_interval=0.002):
+        self.capacity = int(capacity)
+        self.buffer = np.zeros(self.capacity, dtype=np.int16)
+        self.poll_interval = poll_interval
+        self.write_pos = 0
+        self.read_pos = 0
+        self.closed = False
+
+        # 丢样记录：(丢样处的 write_pos, 截至此处累计丢弃的样本数)，生产者追加、消费者取出
+        self.gaps = deque()
+        self.read_offset = 0  # 已读位置之前累计丢弃的样本数
+
+        # 统计信息
+        self.overflows = 0
+        self.dropped_samples = 0
+        self.underruns = 0
+
+    def available(self):
+        return self.write_pos - self.read_pos
+
+    def write(self, samples, block=False):
+        """
+        写入一块样本，返回实际写入的样本数
+
+        block=True 时等待消费者腾出空间（同步回放用，不丢数据），
+        否则空间不足的部分直接丢弃（实时采集，不能阻塞音频回调）
+        """
+        n = len(samples)
+        if block:
+            while not self.closed and self.capacity - self.available() < n:
+                time.sleep(self.poll_interval)
+        if self.closed:
+            return 0
+        written = min(n, self.capacity - self.available())
+        start = self.write_pos % self.capacity
+        first = min(written, self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        self.buffer[:written - first] = samples[first:written]
+        self.write_pos += written
+        if written < n:
+            self.overflows += 1
+            self.dropped_samples += n - written
+            self.gaps.append((self.write_pos, self.dropped_samples))
+        return written
+
+    def read(self, out, timeout=1.0):
+        """
+        读满 out 数组，返回这块样本在音频流中的起始序号
+
+        超时（计为欠载）或缓冲区已关闭且剩余样本不足一块时返回 None
+        """
+        n = len(out)
+        deadline = time.perf_counter() + timeout
+        while self.available() < n:
+            if self.closed:
+                # 关闭前写入的样本已经可见，再确认一次
+                if self.available() < n:
+                    return None
+                break
+            if time.perf_counter() >= deadline:
+                self.underruns += 1
+                return None
+            time.sleep(self.poll_interval)
+        start = self.read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self.buffer[start:start + first]
+        out[first:] = self.buffer[:n - first]
+        # 起始位置之前发生的丢样都计入流时间；块内的丢样从下一块开始计入
+        while self.gaps and self.gaps[0][0] <= self.read_pos:
+            self.read_offset = self.gaps.popleft()[1]
+        position = self.read_pos + self.read_offset
+        self.read_pos += n
+        return position
+
+    def close(self):
+        self.closed = True
+
+
+class MicrophoneSource:
+    """麦克风采集：PyAudio 回调模式，回调里只把数据写入环形缓冲区"""
+
+    def __init__(self, sample_rate=44100, chunk_size=1024, device_index=None):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.device_index = device_index
+        self.finished = False
+        self.ring = None
+        self.pyaudio = None
+        self.audio = None
+        self.stream = None
+
+        # PortAudio 报告的输入溢出/欠载次数
+        self.input_overflows = 0
+        self.input_underflows = 0
+
+    def start(self, ring):
+        import pyaudio
+        self.pyaudio = pyaudio
+        self.ring = ring
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        if status & self.pyaudio.paInputOverflow:
+            self.input_overflows += 1
+        if status & self.pyaudio.paInputUnderflow:
+            self.input_underflows += 1
+        self.ring.write(np.frombuffer(in_data, dtype=np.int16))
+        return (None, self.pyaudio.paContinue)
+
+    def stop(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+        if self.audio is not None:
+            self.audio.terminate()
+            self.audio = None
+
+    def stats(self):
+        return {'input_overflows': self.input_overflows,
+                'input_underflows': self.input_underflows}
+
+
+class ArraySource:
+    """
+    内存中的样本数组作为采集源
+
+    realtime=True 时按采样率的节奏写入（和麦克风一样，处理慢会溢出丢数据）；
+    realtime=False 时同步回放：缓冲区满就等待消费者，不丢数据，可以比实时更快地跑完
+    """
+
+    def __init__(self, samples, sample_rate, chunk_size=1024, realtime=True):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.realtime = realtime
+        self.finished = False
+        self.running = False
+        self.thread = None
+        self.ring = None
+
+    def start(self, ring):
+        self.ring = ring
+        self.running = True
+        self.thread = threading.Thread(target=self._feed_loop, daemon=True)
+        self.thread.start()
+
+    def _feed_loop(self):
+        interval = self.chunk_size / self.sample_rate
+        next_time = time.perf_counter()
+        for start in range(0, len(self.samples), self.chunk_size):
+            if not self.running:
+                break
+            if self.realtime:
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.ring.write(self.samples[start:start + self.chunk_size], block=not self.realtime)
+        self.finished = True
+        self.ring.close()
+
+    def stop(self):
+        self.running = False
+        if self.ring is not None:
+            self.ring.close()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def stats(self):
+        return {}
+
+
+class WavFileSource(ArraySource):
+    """WAV 文件回放，用来代替麦克风做测试；给定 sample_rate 且与文件不同时先重采样"""
+
+    def __init__(self, path, chunk_size=1024, realtime=True, sample_rate=None):
+        samples, file_rate = read_wav(path)
+        if sample_rate is not None and sample_rate != file_rate:
+            samples = resample(samples, file_rate, sample_rate)
+            file_rate = sample_rate
+        super().__init__(samples, file_rate, chunk_size, realtime)
+        self.path = path
+
+
+def create_source(source=None, sample_rate=44100, chunk_size=1024, realtime=True):
+    """根据参数创建采集源：None 为麦克风，字符串为 WAV 文件路径，其他对象原样返回"""
+    if source is None:
+        return MicrophoneSource(sample_rate, chunk_size)
+    if isinstance(source, str):
+        return WavFileSource(source, chunk_size, realtime, sample_rate)
+    return source
+
+
+class AudioCapture:
+    """
+    采集器：把采集源接到环形缓冲区上
+
+    采集源需要提供 sample_rate、finished 属性和 start(ring)/stop()/stats() 方法，
+    消费者用 read() 按块取样本
+    """
+
+    def __init__(self, source, buffer_seconds=2.0):
+        self.source = source
+        self.sample_rate = source.sample_rate
+        self.ring = AudioRingBuffer(int(buffer_seconds * self.sample_rate))
+
+    def start(self):
+        self.source.start(self.ring)
+        return self
+
+    @property
+    def finished(self):
+        return self.ring.closed
+
+    def read(self, out, timeout=1.0):
+        """读满 out，返回起始样本序号（溢出丢掉的样本也计入）；超时或采集结束返回 None"""
+        return self.ring.read(out, timeout)
+
+    def stats(self):
+        """返回写入/读取样本数和溢出/欠载计数"""
+        stats = {'written': self.ring.write_pos,
+                 'read': self.ring.read_pos,
+                 'overflows': self.ring.overflows,
+                 'dropped_samples': self.ring.dropped_samples,
+                 'underruns': self.ring.underruns}
+        stats.update(self.source.stats())
+        return stats
+
+    def close(self):
+        self.source.stop()
+        self.ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
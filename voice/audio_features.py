@@ -0,0 +1,133 @@
+#流式音频特征：短时能量、过零率和频带能量，重叠分帧、整块向量化计算
+from collections import namedtuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 默认频带（Hz）：电机/工频嗡声、语音基频和第一共振峰、语音主要能量、高频嘶声
+DEFAULT_BANDS = ((0, 100), (100, 1000), (1000, 3400), (3400, 24000))
+# 参与“语音占比”计算的频带下标
+SPEECH_BANDS = (1, 2)
+
+# 一次 process() 得到的全部帧特征，数组长度为本次产生的帧数
+# rms: 每帧均方根能量（int16幅度单位）；zcr: 过零率（0~1）；bands: 每帧各频带能量；
+# speech_ratio: 语音频带能量占比；start_sample: 第一帧起点在整个音频流中的样本序号
+FeatureFrames = namedtuple('FeatureFrames', ['rms', 'zcr', 'bands', 'speech_ratio', 'start_sample', 'hop'])
+
+
+class StreamingFeatureExtractor:
+    """
+    流式特征提取器
+
+    输入任意长度的 int16 音频块，按 frame_ms 帧长、hop_ms 帧移做重叠分帧，
+    上一块末尾不足一帧的样本留到下一块。所有帧的特征对整块一次向量化计算，
+    分帧使用 sliding_window_view 不复制数据，加窗、能量等中间结果写入预分配的缓冲区。
+    返回的数组是内部缓冲区的视图，下一次调用 process() 后失效
+    """
+
+    def __init__(self, sample_rate=44100, frame_ms=25.0, hop_ms=10.0, bands=DEFAULT_BANDS,
+                 speech_bands=SPEECH_BANDS, max_chunk=4096):
+        self.sample_rate = sample_rate
+        self.frame_length = int(round(sample_rate * frame_ms / 1000.0))
+        self.hop = int(round(sample_rate * hop_ms / 1000.0))
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hanning(self.frame_length).astype(np.float32)
+
+        # 频带矩阵：功率谱 (帧数 x 频点) @ 矩阵 (频点 x 频带) = 频带能量
+        freqs = np.fft.rfftfreq(self.n_fft, 1.0 / sample_rate)
+        self.band_matrix = np.zeros((len(freqs), len(bands)), dtype=np.float32)
+        for i, (low, high) in enumerate(bands):
+            self.band_matrix[(freqs >= low) & (freqs < high), i] = 1.0
+        self.bands = tuple(bands)
+        self.speech_bands = list(speech_bands)
+
+        self.sample_count = 0  # 已经完整消费（移出缓冲区）的样本数
+        self.pending = 0       # 缓冲区中尚未成帧的样本数
+        self._allocate(max_chunk)
+
+    def _allocate(self, max_chunk):
+        self.max_chunk = max_chunk
+        capacity = self.frame_length + max_chunk
+        max_frames = capacity // self.hop + 1
+        old = getattr(self, 'buffer', None)
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        if old is not None and self.pending:
+            self.buffer[:self.pending] = old[:self.pending]
+        self.signs = np.zeros(capacity, dtype=bool)
+        self.changes = np.zeros(capacity, dtype=bool)
+        self.crossings = np.zeros(capacity, dtype=np.int32)
+        self.windowed = np.zeros((max_frames, self.frame_length), dtype=np.float32)
+        self.rms = np.zeros(max_frames, dtype=np.float32)
+        self.zcr = np.zeros(max_frames, dtype=np.float32)
+        self.band_energy = np.zeros((max_frames, len(self.bands)), dtype=np.float32)
+        self.speech_ratio = np.zeros(max_frames, dtype=np.float32)
+
+    def reset(self):
+        self.sample_count = 0
+        self.pending = 0
+
+    def skip(self, count):
+        """输入流丢了 count 个样本：丢掉不足一帧的尾部，样本计数越过缺口，帧不会跨越缺口"""
+        self.sample_count += self.pending + count
+        self.pending = 0
+
+    def process(self, chunk):
+        """送入一块 int16 样本（ndarray 或 bytes），返回本次新产生的帧特征 FeatureFrames"""
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = np.frombuffer(chunk, dtype=np.int16)
+        if len(chunk) > self.max_chunk:
+            self._allocate(len(chunk))
+
+        end = self.pending + len(chunk)
+        self.buffer[self.pending:end] = chunk
+        start_sample = self.sample_count
+
+        if end < self.frame_length:
+            self.pending = end
+            return self._result(0, start_sample)
+
+        n = (end - self.frame_length) // self.hop + 1
+        samples = self.buffer[:end]
+        frames = sliding_window_view(samples, self.frame_length)[::self.hop][:n]
+
+        # 短时能量（RMS），einsum 逐帧点积，不产生 帧数x帧长 的临时数组
+        rms = self.rms[:n]
+        np.einsum('ij,ij->i', frames, frames, out=rms)
+        rms /= self.frame_length
+        np.sqrt(rms, out=rms)
+
+        # 过零率：整段只算一次符号变化的前缀和，每帧取首尾之差
+        signs = self.signs[:end]
+        np.signbit(samples, out=signs)
+        crossings = self.crossings[:end]
+        crossings[0] = 0
+        changes = self.changes[:end - 1]
+        np.not_equal(signs[1:], signs[:-1], out=changes)
+        np.cumsum(changes, dtype=np.int32, out=crossings[1:])
+        starts = np.arange(n) * self.hop
+        zcr = self.zcr[:n]
+        np.subtract(crossings[starts + self.frame_length - 1], crossings[starts], out=zcr)
+        zcr /= (self.frame_length - 1)
+
+        # 频带能量：加窗 -> 实数FFT -> 功率谱 -> 乘频带矩阵
+        windowed = self.windowed[:n]
+        np.multiply(frames, self.window, out=windowed)
+        spectrum = np.fft.rfft(windowed, self.n_fft, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        power /= self.n_fft
+        bands = self.band_energy[:n]
+        np.matmul(power, self.band_matrix, out=bands)
+
+        speech = self.speech_ratio[:n]
+        np.sum(bands[:, self.speech_bands], axis=1, out=speech)
+        speech /= np.maximum(bands.sum(axis=1), 1e-9)
+
+        # 把不足一帧的尾部样本移到缓冲区开头
+        consumed = n * self.hop
+        self.pending = end - consumed
+        self.buffer[:self.pending] = self.buffer[consumed:end]
+        self.sample_count += consumed
+        return self._result(n, start_sample)
+
+    def _result(self, n, start_sample):
+        return FeatureFrames(self.rms[:n], self.zcr[:n], self.band_energy[:n],
+                             self.speech_ratio[:n], start_sample, self.hop)
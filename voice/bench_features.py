@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#特征提取基准测试：每秒音频的处理耗时，对比原来的整块RMS
+import argparse
+import time
+import numpy as np
+
+from audio_capture import read_wav
+from audio_features import StreamingFeatureExtractor
+
+
+def synthetic_audio(seconds, sample_rate, seed=0):
+    """生成测试音频：背景噪声 + 间隔出现的双音节“语音”（带谐波的浊音）+ 偶发敲击噪声"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    audio = rng.normal(0, 150, n)
+
+    # 每2秒一组双音节：0.3s 音节、0.1s 间隔、0.3s 音节（加窗后有效间隔约0.2s）
+    for start in np.arange(0.5, seconds - 1.0, 2.0):
+        for offset in (0.0, 0.4):
+            s, e = int((start + offset) * sample_rate), int((start + offset + 0.3) * sample_rate)
+            f0 = rng.uniform(120, 220)
+            voice = sum(np.sin(2 * np.pi * f0 * k * t[s:e]) / k for k in range(1, 8))
+            audio[s:e] += 3000 * voice * np.hanning(e - s)
+
+    # 敲击噪声：5ms 宽带脉冲
+    for start in rng.uniform(0, seconds - 0.01, int(seconds)):
+        s = int(start * sample_rate)
+        audio[s:s + int(0.005 * sample_rate)] += rng.normal(0, 8000, int(0.005 * sample_rate))
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def legacy_volume(chunk):
+    """原 _calculate_volume()：转 float64 后整块算一个RMS"""
+    return np.sqrt(np.mean(chunk.astype(np.float64) ** 2))
+
+
+def seconds_per_audio_second(func, audio, chunk_size, sample_rate, repeat=3):
+    """按块调用 func 处理整段音频，返回处理1秒音频所需的毫秒数（取多次中的最小值）"""
+    chunks = [audio[i:i + chunk_size] for i in range(0, len(audio) - chunk_size + 1, chunk_size)]
+    duration = len(chunks) * chunk_size / sample_rate
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for chunk in chunks:
+            func(chunk)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0 / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='音频特征提取耗时（每秒音频）')
+    parser.add_argument('--wav', default=None, help='单声道16bit WAV文件，为空时生成合成音频')
+    parser.add_argument('--seconds', type=float, default=60.0, help='合成音频时长')
+    parser.add_argument('--rates', default='44100,16000', help='合成音频的采样率列表，逗号分隔')
+    parser.add_argument('--chunk', type=int, default=1024, help='每次送入的样本数')
+    args = parser.parse_args()
+
+    if args.wav:
+        audio, rate = read_wav(args.wav)
+        sources = [(rate, audio)]
+    else:
+        sources = [(rate, synthetic_audio(args.seconds, rate))
+                   for rate in (int(r) for r in args.rates.split(','))]
+
+    for rate, audio in sources:
+        extractor = StreamingFeatureExtractor(rate, max_chunk=args.chunk)
+        print(f"采样率 {rate} Hz | 时长 {len(audio) / rate:.1f}s | 块大小 {args.chunk} | "
+              f"帧长 {extractor.frame_length} 帧移 {extractor.hop} FFT {extractor.n_fft}")
+        for name, func in (('原整块RMS', legacy_volume), ('流式特征提取', extractor.process)):
+            cost = seconds_per_audio_second(func, audio, args.chunk, rate)
+            print(f"  {name:<12} {cost:8.3f} ms/秒音频 | 占用单核 {cost / 10.0:6.3f}%")
+
+
+if __name__ == '__main__':
+    main()
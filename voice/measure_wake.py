@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+#离线测量唤醒时序：用 WAV 文件复现音节边界、唤醒时刻和检测延迟
+import argparse
+import time
+
+from wake_up import SimpleAudioWakeup
+
+
+def run_detector(path, sample_rate, chunk_size=None):
+    """离线跑一遍检测器，返回 (检测器, 唤醒事件列表, CPU秒数)"""
+    detector = SimpleAudioWakeup(path, realtime=False, sample_rate=sample_rate, chunk_size=chunk_size,
+                                 verbose=False)
+    start = time.process_time()
+    events = detector.process_audio(detector.source.samples)
+    cpu = time.process_time() - start
+    return detector, events, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description='离线测量唤醒延迟和音节时序')
+    parser.add_argument('wav', help='单声道16bit WAV文件')
+    parser.add_argument('--rates', default='44100,16000', help='要对比的采样率列表，逗号分隔')
+    parser.add_argument('--chunk', type=int, default=None, help='块大小，默认约23ms')
+    parser.add_argument('--expected', default='', help='每个唤醒词的结束时刻(秒)，逗号分隔，用于计算时序误差')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='事件与标注匹配的最大时间差(秒)')
+    args = parser.parse_args()
+
+    expected = [float(t) for t in args.expected.split(',') if t]
+
+    for rate in (int(r) for r in args.rates.split(',')):
+        detector, events, cpu = run_detector(args.wav, rate, args.chunk)
+        duration = len(detector.source.samples) / rate
+        print(f"采样率 {rate} Hz | 块 {detector.chunk_size} | 音频 {duration:.2f}s | "
+              f"CPU {cpu * 1000.0 / duration:.2f} ms/秒音频 | 唤醒 {len(events)} 次")
+
+        for event in events:
+            latency = event.time - event.second.end
+            line = (f"  唤醒 @ {event.time:7.3f}s | 音节1 {event.first.start:6.3f}-{event.first.end:6.3f}s | "
+                    f"间隔 {event.gap:.3f}s | 音节2 {event.second.start:6.3f}-{event.second.end:6.3f}s | "
+                    f"延迟 {latency * 1000.0:6.1f} ms")
+            matches = [t for t in expected if abs(event.second.end - t) <= args.tolerance]
+            if matches:
+                error = event.second.end - min(matches, key=lambda t: abs(event.second.end - t))
+                line += f" | 结束时刻误差 {error * 1000.0:+6.1f} ms"
+            elif expected:
+                line += " | 误唤醒"
+            print(line)
+
+        if expected:
+            hits = sum(any(abs(e.second.end - t) <= args.tolerance for e in events) for t in expected)
+            print(f"  命中 {hits}/{len(expected)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#增量噪声底估计：对数域的运行百分位跟踪，每块 O(1) 更新
+import math
+
+
+class NoiseFloorTracker:
+    """
+    噪声底估计器
+
+    在对数域跟踪音量的第 percentile 百分位：新值高于估计值时上调 rate*percentile，
+    低于时下调 rate*(1-percentile)，稳定后估计值以上的样本恰好占 1-percentile。
+    percentile 取较小值时等价于指数最小值跟踪：噪声变小时快速跟下来，
+    变大（电机、风扇启动）时在 rise_time 秒量级内缓慢跟上，短暂的语音几乎不影响估计。
+    启动后的 warmup 秒内用更快的速率收敛，不需要单独的静音校准阶段
+    """
+
+    def __init__(self, percentile=0.2, rise_time=2.0, warmup=1.0, warmup_speedup=10.0):
+        self.percentile = percentile
+        self.rise_time = rise_time
+        self.warmup = warmup
+        self.warmup_speedup = warmup_speedup
+        self.reset()
+
+    def reset(self):
+        self.log_floor = None
+        self.elapsed = 0.0  # 已参与估计的音频时长(秒)
+
+    @property
+    def floor(self):
+        return math.exp(self.log_floor) if self.log_floor is not None else 0.0
+
+    def update(self, volume, duration):
+        """
+        用一块非语音音频的音量更新估计，duration 为这块音频的时长(秒)，返回新的噪声底
+
+        对数步长按时长换算：持续高于估计值 rise_time 秒，估计值约上升 e 倍
+        """
+        log_volume = math.log(max(volume, 1.0))
+        if self.log_floor is None:
+            self.log_floor = log_volume
+            self.elapsed = duration
+            return self.floor
+
+        rate = duration / (self.rise_time * self.percentile)
+        if self.elapsed < self.warmup:
+            rate *= self.warmup_speedup
+        if log_volume > self.log_floor:
+            self.log_floor = min(self.log_floor + rate * self.percentile, log_volume)
+        else:
+            self.log_floor = max(self.log_floor - rate * (1.0 - self.percentile), log_volume)
+        self.elapsed += duration
+        return self.floor
@@ -0,0 +1,72 @@
+#音节切分状态机：按帧判断发声，时间戳由样本计数换算，与线程调度和读取时刻无关
+from collections import namedtuple
+import numpy as np
+
+# start/end/duration 单位为秒，从音频流第一个样本算起；
+# detected_at 为确认音节结束的时刻（结束后还要等 hangover 的静音才能确认）
+Syllable = namedtuple('Syllable', ['start', 'end', 'duration', 'detected_at'])
+
+
+class SyllableSegmenter:
+    """
+    音节切分器
+
+    输入每帧是否发声（布尔数组）和第一帧的样本位置，按连续段（run）推进状态，
+    不逐帧循环。发声后的静音持续 hangover 秒才结束音节，音节内部的短暂能量下陷
+    不会把一个音节切成两段；音节结束时刻取第一帧静音帧的位置，而不是确认时刻。
+    音节时长是否合理由调用方判断
+    """
+
+    def __init__(self, sample_rate, hangover=0.04):
+        self.sample_rate = sample_rate
+        self.hangover_samples = int(round(hangover * sample_rate))
+        self.reset()
+
+    def reset(self):
+        self.in_syllable = False
+        self.start_sample = 0
+        self.silence_start = None  # 音节中第一帧静音帧的样本位置，None 表示仍在发声
+
+    def update(self, voiced, first_position, hop):
+        """
+        送入一批帧的发声判断，返回本批中结束的音节列表
+
+        voiced: 每帧是否发声；first_position: 第一帧（中心）的样本位置；hop: 帧移（样本数）
+        """
+        syllables = []
+        n = len(voiced)
+        if n == 0:
+            return syllables
+
+        voiced = np.asarray(voiced, dtype=bool)
+        boundaries = np.flatnonzero(voiced[1:] != voiced[:-1]) + 1
+        run_starts = np.concatenate(([0], boundaries))
+        run_ends = np.concatenate((boundaries, [n]))
+
+        for first, last in zip(run_starts.tolist(), run_ends.tolist()):
+            position = first_position + first * hop
+            if voiced[first]:
+                if not self.in_syllable:
+                    self.in_syllable = True
+                    self.start_sample = position
+                self.silence_start = None
+                continue
+
+            if not self.in_syllable:
+                continue
+            if self.silence_start is None:
+                self.silence_start = position
+            # 静音持续到本段最后一帧之后仍不足 hangover，留给下一批继续判断
+            silence_end = first_position + last * hop
+            if silence_end - self.silence_start < self.hangover_samples:
+                continue
+
+            syllables.append(self._close(self.silence_start + self.hangover_samples))
+        return syllables
+
+    def _close(self, confirm_sample):
+        self.in_syllable = False
+        start = self.start_sample / self.sample_rate
+        end = self.silence_start / self.sample_rate
+        self.silence_start = None
+        return Syllable(start, end, end - start, confirm_sample / self.sample_rate)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+#录入唤醒词模板：用音节门限切出每次“你好”，算类MFCC特征，保存模板和建议阈值
+#
+#用法示例：
+#  python3 wake_enroll.py --output nihao.npz --count 5          # 用麦克风录5遍
+#  python3 wake_enroll.py --output nihao.npz a.wav b.wav c.wav  # 用已有的录音
+#  python3 wake_up.py --templates nihao.npz
+import argparse
+import itertools
+import time
+import numpy as np
+
+from audio_capture import ArraySource, AudioCapture, MicrophoneSource, WavFileSource
+from wake_up import SimpleAudioWakeup
+from wake_verify import WakeVerifier, dtw_distance
+
+
+def record(seconds, sample_rate, chunk_size=512):
+    """从麦克风录一段音频，返回 int16 样本数组"""
+    capture = AudioCapture(MicrophoneSource(sample_rate, chunk_size), buffer_seconds=seconds + 1.0).start()
+    chunk = np.zeros(chunk_size, dtype=np.int16)
+    chunks = []
+    try:
+        for _ in range(int(seconds * sample_rate / chunk_size)):
+            if capture.read(chunk, timeout=2.0) is None:
+                break
+            chunks.append(chunk.copy())
+    finally:
+        capture.close()
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+
+def extract_wake_word(samples, sample_rate, margin=0.05):
+    """
+    用和运行时相同的音节门限找到录音中的双音节，返回截取的样本；没有检测到时返回 None
+
+    截取范围和检测器二次确认时一致（两个音节两侧各留 margin 秒），模板和运行时的输入才可比
+    """
+    detector = SimpleAudioWakeup(ArraySource(samples, sample_rate), sample_rate=sample_rate, verbose=False)
+    events = detector.process_audio(samples)
+    if not events:
+        return None
+    event = events[0]
+    start = max(int((event.first.start - margin) * sample_rate), 0)
+    end = int((event.second.end + margin) * sample_rate)
+    return samples[start:end]
+
+
+def suggest_threshold(templates, slack=1.3):
+    """模板两两之间DTW距离的最大值乘以余量，作为接受阈值"""
+    distances = [dtw_distance(a, b) for a, b in itertools.combinations(templates, 2)]
+    return max(distances) * slack if distances else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='录入唤醒词模板')
+    parser.add_argument('wavs', nargs='*', help='录音文件（单声道16bit WAV），为空时用麦克风录音')
+    parser.add_argument('--output', default='wake_templates.npz', help='模板保存路径')
+    parser.add_argument('--count', type=int, default=5, help='麦克风录音次数')
+    parser.add_argument('--seconds', type=float, default=2.5, help='每次录音时长')
+    parser.add_argument('--rate', type=int, default=16000, help='模板特征的采样率')
+    parser.add_argument('--threshold', type=float, default=None, help='手动指定接受阈值，默认由模板间距离估计')
+    args = parser.parse_args()
+
+    recordings = []
+    if args.wavs:
+        for path in args.wavs:
+            source = WavFileSource(path, realtime=False, sample_rate=args.rate)
+            recordings.append((path, source.samples))
+    else:
+        for i in range(args.count):
+            input(f"[{i + 1}/{args.count}] 按回车后说“你好”...")
+            recordings.append((f"录音{i + 1}", record(args.seconds, args.rate)))
+
+    verifier = WakeVerifier([], args.rate)
+    segments = []
+    for name, samples in recordings:
+        segment = extract_wake_word(samples, args.rate)
+        if segment is None:
+            print(f"⚠️ {name}: 没有检测到双音节，已跳过")
+            continue
+        features = verifier.features(segment)
+        verifier.templates.append(features)
+        segments.append(segment)
+        print(f"✅ {name}: {len(segment) / args.rate:.2f}s，{len(features)} 帧")
+
+    if not verifier.templates:
+        print("❌ 没有可用的模板")
+        return
+
+    threshold = args.threshold or suggest_threshold(verifier.templates)
+    if threshold is None:
+        print("⚠️ 只有一个模板，无法估计阈值，使用默认值")
+    else:
+        verifier.threshold = threshold
+    verifier.save(args.output)
+    print(f"已保存 {len(verifier.templates)} 个模板到 {args.output}，接受阈值 {verifier.threshold:.2f}")
+
+    # 每次确认的耗时：特征提取 + 与所有模板的DTW（含提前放弃）
+    timings = []
+    for segment in segments:
+        start = time.perf_counter()
+        verifier.verify(segment)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    print(f"单次确认耗时: 平均 {np.mean(timings):.2f} ms，最大 {np.max(timings):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
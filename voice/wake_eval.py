@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+#唤醒检测批量评估：多进程离线跑完一个带标注的 WAV 目录，扫描参数组合
+#
+#标注约定（每个 WAV 文件）：
+#  同名 .txt 文件：每行一个唤醒词的结束时刻（秒），空文件表示没有唤醒词
+#  没有 .txt 但位于 positive/ 目录下：恰好一个唤醒词，不标时刻（不参与延迟统计）
+#  其他文件：没有唤醒词，只用来统计误唤醒
+#
+#用法示例：
+#  python3 wake_eval.py corpus/ --grid base_threshold=600,800,1000 --grid max_gap_duration=0.2,0.25,0.3
+#  固定阈值（自动关闭噪声底跟踪）：--grid dynamic_threshold=600,800,1000
+#  块大小：--grid chunk_size=256,512,1024
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from audio_capture import WavFileSource
+from audio_features import StreamingFeatureExtractor
+from syllable_segmenter import SyllableSegmenter
+from wake_up import SimpleAudioWakeup
+
+
+def load_labels(wav_path):
+    """读取一个文件的标注，返回唤醒词结束时刻列表；不标时刻的正样本返回 [None]"""
+    label_path = os.path.splitext(wav_path)[0] + '.txt'
+    if os.path.exists(label_path):
+        with open(label_path, encoding='utf-8') as f:
+            return [float(line) for line in f if line.strip()]
+    if 'positive' in os.path.normpath(wav_path).split(os.sep):
+        return [None]
+    return []
+
+
+def find_corpus(root):
+    """递归查找目录下所有 WAV 文件，返回 [(路径, 标注)]"""
+    items = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.lower().endswith('.wav'):
+                path = os.path.join(dirpath, name)
+                items.append((path, load_labels(path)))
+    return sorted(items)
+
+
+def parse_grid(specs):
+    """把 ['name=v1,v2', ...] 展开成参数组合列表"""
+    names, values = [], []
+    for spec in specs:
+        name, _, raw = spec.partition('=')
+        names.append(name.strip())
+        values.append([float(v) for v in raw.split(',') if v])
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def apply_params(detector, params):
+    """
+    把参数写到检测器属性上，未知参数直接报错，避免拼写错误的参数被悄悄忽略
+
+    扫描 dynamic_threshold 时关闭噪声底跟踪，否则 reset() 会把它改回 base_threshold；
+    chunk_size 变化时按新块长重建特征提取器和读缓冲区。采样率由 --rate 决定，不能在这里扫描
+    """
+    if 'sample_rate' in params:
+        raise ValueError("sample_rate 不能作为扫描参数，请用 --rate 指定")
+    if 'dynamic_threshold' in params:
+        if params.get('adaptive_threshold', 0):
+            raise ValueError("dynamic_threshold 是固定阈值，不能与 adaptive_threshold=1 同时扫描")
+        detector.adaptive_threshold = False
+    for name, value in params.items():
+        if not hasattr(detector, name):
+            raise ValueError(f"未知的检测器参数: {name}")
+        if name in ('chunk_size', 'min_activation_count'):
+            value = int(value)
+        elif name == 'adaptive_threshold':
+            value = bool(value)
+        setattr(detector, name, value)
+    if 'chunk_size' in params:
+        detector.chunk_buffer = np.zeros(detector.chunk_size, dtype=np.int16)
+        detector.feature_extractor = StreamingFeatureExtractor(detector.sample_rate, max_chunk=detector.chunk_size)
+    # hangover 在切分器里换算成样本数，需要重建
+    detector.segmenter = SyllableSegmenter(detector.sample_rate, detector.hangover)
+
+
+def evaluate_file(path, labels, configs, sample_rate, tolerance, templates=None):
+    """
+    在一个文件上依次评估所有参数组合（工作进程中执行，文件只读一次）
+
+    返回每个组合的计数：命中、漏检、误唤醒、延迟列表、CPU秒数和音频时长
+    """
+    source = WavFileSource(path, realtime=False, sample_rate=sample_rate)
+    duration = len(source.samples) / source.sample_rate
+    results = []
+    for params in configs:
+        detector = SimpleAudioWakeup(source, sample_rate=source.sample_rate, templates=templates, verbose=False)
+        apply_params(detector, params)
+        start = time.process_time()
+        events = detector.process_audio(source.samples)
+        cpu = time.process_time() - start
+
+        # 事件按时间和标注逐一配对，每个标注最多被命中一次
+        unmatched = list(labels)
+        hits, latencies, false_accepts = 0, [], 0
+        for event in events:
+            match = next((i for i, label in enumerate(unmatched)
+                          if label is None or abs(event.second.end - label) <= tolerance), None)
+            if match is None:
+                false_accepts += 1
+                continue
+            label = unmatched.pop(match)
+            hits += 1
+            if label is not None:
+                latencies.append(event.time - label)
+
+        results.append({'hits': hits, 'misses': len(unmatched), 'false_accepts': false_accepts,
+                        'latencies': latencies, 'cpu': cpu, 'duration': duration})
+    return path, results
+
+
+def summarize(config, per_file):
+    """汇总一个参数组合在所有文件上的结果"""
+    hits = sum(r['hits'] for r in per_file)
+    misses = sum(r['misses'] for r in per_file)
+    false_accepts = sum(r['false_accepts'] for r in per_file)
+    hours = sum(r['duration'] for r in per_file) / 3600.0
+    cpu = sum(r['cpu'] for r in per_file)
+    latencies = np.array([l for r in per_file for l in r['latencies']], dtype=np.float64)
+    expected = hits + misses
+    return {
+        'params': config,
+        'expected': expected,
+        'hits': hits,
+        'miss_rate': round(misses / expected, 4) if expected else None,
+        'false_accepts': false_accepts,
+        'fa_per_hour': round(false_accepts / hours, 3) if hours else None,
+        'latency_mean_ms': round(float(np.mean(latencies)) * 1000.0, 1) if len(latencies) else None,
+        'latency_p95_ms': round(float(np.percentile(latencies, 95)) * 1000.0, 1) if len(latencies) else None,
+        'cpu_s_per_audio_hour': round(cpu / hours, 2) if hours else None,
+    }
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '-'.rjust(len(format(0, spec)))
+
+
+def format_row(summary):
+    params = ' '.join(f"{k}={v:g}" for k, v in summary['params'].items()) or '默认参数'
+    return (f"{params:<48} 漏检率 {_fmt(summary['miss_rate'], '6.3f')} | "
+            f"误唤醒/小时 {_fmt(summary['fa_per_hour'], '8.2f')} | "
+            f"延迟 {_fmt(summary['latency_mean_ms'], '6.1f')} ms (p95 {_fmt(summary['latency_p95_ms'], '6.1f')}) | "
+            f"CPU {_fmt(summary['cpu_s_per_audio_hour'], '7.2f')} s/音频小时")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='唤醒检测批量离线评估')
+    parser.add_argument('corpus', help='带标注的 WAV 目录')
+    parser.add_argument('--grid', action='append', default=[],
+                        help='参数扫描，如 dynamic_threshold=600,800,1000，可重复指定')
+    parser.add_argument('--rate', type=int, default=44100, help='检测采样率')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='事件与标注匹配的最大时间差(秒)')
+    parser.add_argument('--templates', default=None, help='唤醒词模板文件，启用二次确认')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认为CPU核数')
+    parser.add_argument('--output', default=None, help='把结果保存为JSON文件')
+    args = parser.parse_args()
+
+    corpus = find_corpus(args.corpus)
+    if not corpus:
+        print(f"目录中没有 WAV 文件: {args.corpus}")
+        return
+    configs = parse_grid(args.grid) or [{}]
+    positives = sum(len(labels) for _, labels in corpus)
+    print(f"{len(corpus)} 个文件，{positives} 个唤醒词，{len(configs)} 组参数")
+
+    start = time.perf_counter()
+    per_config = [[] for _ in configs]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(evaluate_file, path, labels, configs, args.rate, args.tolerance, args.templates)
+                   for path, labels in corpus]
+        for future in futures:
+            _, results = future.result()
+            for i, result in enumerate(results):
+                per_config[i].append(result)
+    wall = time.perf_counter() - start
+
+    audio_seconds = sum(r['duration'] for r in per_config[0])
+    print(f"音频 {audio_seconds / 60.0:.1f} 分钟 x {len(configs)} 组参数，耗时 {wall:.1f}s，"
+          f"{audio_seconds * len(configs) / wall:.0f} 倍实时\n")
+
+    summaries = [summarize(config, results) for config, results in zip(configs, per_config)]
+    # 先按漏检率、再按误唤醒率排序
+    summaries.sort(key=lambda s: (s['miss_rate'] or 0, s['fa_per_hour'] or 0))
+    for summary in summaries:
+        print(format_row(summary))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'corpus': args.corpus, 'rate': args.rate, 'files': len(corpus),
+                       'audio_seconds': audio_seconds, 'results': summaries},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到 {args.output}")
+
+
+if __name__ == '__main__':
+    main()
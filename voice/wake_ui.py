@@ -0,0 +1,110 @@
+#唤醒检测的控制台界面：在单独的线程中按固定频率读取检测器的最新状态并绘制
+import queue
+import sys
+import threading
+import time
+
+
+class ConsoleRenderer:
+    """
+    控制台渲染器
+
+    音频线程只更新检测器上的状态（last_volume、dynamic_threshold 等）并把唤醒事件放进队列，
+    从不打印。渲染线程每 interval 秒读一次最新状态画音量条，取出队列中的事件显示，
+    终端输出慢或被阻塞时只会让界面变卡，不会让音频丢帧
+    """
+
+    def __init__(self, detector, interval=0.05, bar_length=50, max_display=5000):
+        self.detector = detector
+        self.interval = interval
+        self.bar_length = bar_length
+        self.max_display = max_display      # 音量显示的最大值
+        self.events = detector.add_queue()
+        self.rejected_shown = 0
+        self.errors_shown = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        # 检测结束前最后一个刷新周期内的事件也要显示出来
+        self._show_pending()
+        self.detector.remove_queue(self.events)
+
+    def _show_pending(self):
+        try:
+            while True:
+                self._show_wake(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        self._show_rejections()
+        self._show_errors()
+
+    def _render_loop(self):
+        while self.running:
+            self._show_pending()
+            self._draw_volume()
+            time.sleep(self.interval)
+
+    def _write(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def _draw_volume(self):
+        """显示音量可视化"""
+        volume = self.detector.last_volume
+        threshold = self.detector.dynamic_threshold
+        bar_length = int(min(1.0, volume / self.max_display) * self.bar_length)
+
+        # 确定音量条颜色/符号
+        if volume < self.detector.silence_threshold:
+            bar_char, status = ' ', "安静"
+        elif volume < threshold:
+            bar_char, status = '░', "背景音"
+        else:
+            bar_char, status = '█', "检测中"
+
+        volume_bar = bar_char * bar_length + ' ' * (self.bar_length - bar_length)
+        status_text = f"音量: {volume:5.1f} | 阈值: {threshold:5.1f} | 状态: {status}"
+        self._write(f"\033[K[{volume_bar}] {status_text}\r")
+
+    def _show_wake(self, event):
+        """显示一次唤醒（ANSI 转义清屏，不再启动 clear 子进程）"""
+        lines = ["\033[2J\033[H",
+                 "🎯 检测到双音节模式！",
+                 f"   第一音节: {event.first.duration:.2f}秒",
+                 f"   间隔: {event.gap:.2f}秒",
+                 f"   第二音节: {event.second.duration:.2f}秒"]
+        if event.distance is not None:
+            lines.append(f"   模板匹配距离: {event.distance:.2f}")
+        lines += ["=" * 60,
+                  "🔊 检测到'你好'音节模式！",
+                  "📱 设备已唤醒，准备接收指令...",
+                  "=" * 60,
+                  "👋 你好！系统已激活...",
+                  ""]
+        self._write("\n".join(lines) + "\n")
+
+    def _show_rejections(self):
+        """按累计计数显示新的拒绝，多次拒绝合并为一行，距离取最近一次"""
+        count = self.detector.rejected_count
+        new = count - self.rejected_shown
+        if new > 0 and self.detector.rejected_events:
+            event = self.detector.rejected_events[-1]
+            times = f" {new} 次" if new > 1 else ""
+            self._write(f"\033[K   ❎ 模板匹配未通过{times} (DTW距离 {event.distance:.2f} > "
+                        f"阈值 {self.detector.verifier.threshold:.2f})\n")
+        self.rejected_shown = count
+
+    def _show_errors(self):
+        if self.detector.error_count > self.errors_shown:
+            self._write(f"\033[K⚠️ 音频处理出错: {self.detector.last_error}\n")
+            self.errors_shown = self.detector.error_count
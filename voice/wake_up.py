@@ -1,136 +1,193 @@
-import time
 import threading
 import math
 import numpy as np
-import os
-import sys
+import queue
+import argparse
+from collections import deque, namedtuple
+from audio_features import StreamingFeatureExtractor
+from audio_capture import AudioCapture, create_source
+from syllable_segmenter import SyllableSegmenter
+from noise_floor import NoiseFloorTracker
+from wake_verify import WakeVerifier
+from wake_ui import ConsoleRenderer
+
+# 一次唤醒：time 为检测器得出结论的时刻（所在块的末尾），first/second 为两个音节，
+# 所有时间都是从音频流第一个样本起算的秒数，由样本计数换算；
+# distance 为二次确认的DTW距离，没有启用确认时为 None
+WakeEvent = namedtuple('WakeEvent', ['time', 'first', 'gap', 'second', 'distance'], defaults=(None,))
 
 class SimpleAudioWakeup:
     """
     优化版简单音频唤醒检测器
     
-    这个版本通过实时模式检测和可视化反馈，提高了检测速度和用户体验
+    这个版本通过实时模式检测和可视化反馈，提高了检测速度和用户体验。
+    检测线程不做任何输出：唤醒事件通过 subscribe()/add_queue() 交给订阅者，
+    界面由 wake_ui.ConsoleRenderer 在单独的线程中读取最新状态绘制
     """
     
-    def __init__(self):
-        # 尝试导入pyaudio
-        try:
-            import pyaudio
-            self.pyaudio = pyaudio
+    def __init__(self, source=None, realtime=True, sample_rate=44100, chunk_size=None, templates=None,
+                 verbose=True):
+        # source 为 None 时使用麦克风（需要pyaudio），也可以传入 WAV 文件路径代替麦克风
+        # sample_rate 可以降到 16000 以减少每秒音频的计算量，WAV 文件会重采样到该采样率
+        # templates 为 wake_enroll.py 录入的模板文件，给定时音节模式触发后再做模板匹配确认
+        # verbose=False 时完全静默（生产环境作为服务运行），启动/停止信息也不打印
+        self.verbose = verbose
+        if source is None:
+            try:
+                import pyaudio
+                self.audio_available = True
+                self._log("✅ 音频系统初始化成功")
+            except ImportError:
+                self._log("❌ 无法导入pyaudio库")
+                self._log("请运行: pip install pyaudio")
+                self.audio_available = False
+                return
+        else:
             self.audio_available = True
-            print("✅ 音频系统初始化成功")
-        except ImportError:
-            print("❌ 无法导入pyaudio库")
-            print("请运行: pip install pyaudio")
-            self.audio_available = False
-            return
         
-        # 音频参数配置
-        self.chunk_size = 1024      
-        self.sample_rate = 44100    
+        # 音频参数配置（块长约23ms，取2的幂：44.1kHz 为1024，16kHz 为512）
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size or 2 ** int(round(math.log2(sample_rate * 0.023)))
         self.channels = 1           
-        self.format = self.pyaudio.paInt16
+        
+        # 采集源：回调模式写入环形缓冲区，WAV 文件重采样到检测用的采样率
+        self.source = create_source(source, self.sample_rate, self.chunk_size, realtime)
+        self.sample_rate = self.source.sample_rate
+        self.buffer_seconds = 2.0          # 环形缓冲区长度(秒)
+        self.chunk_buffer = np.zeros(self.chunk_size, dtype=np.int16)
+        
+        # 流式特征提取：25ms帧长、10ms帧移，缓冲区按块大小预分配
+        self.feature_extractor = StreamingFeatureExtractor(self.sample_rate, max_chunk=self.chunk_size)
         
         # 声音检测的关键参数 - 调整为更敏感的值
         self.base_threshold = 800   # 降低基础阈值以提高灵敏度
         self.dynamic_threshold = 800
         self.silence_threshold = 400
         
+        # 自适应阈值：非语音期间持续跟踪噪声底，阈值 = max(噪声底 x 倍数, 基础阈值)
+        # 取代启动时的3秒静音校准，机器人移动、电机启停时阈值会跟着变化
+        self.adaptive_threshold = True
+        self.noise_multiplier = 2.5
+        self.noise_tracker = NoiseFloorTracker(percentile=0.2, rise_time=2.0)
+        
         # 模式识别参数 - 优化为更适合中文双音节
         self.min_syllable_duration = 0.15  # 缩短最小音节时长
         self.max_syllable_duration = 0.7   # 调整最大音节时长
         self.max_gap_duration = 0.25       # 缩短最大间隔时间
         self.min_activation_count = 2      # 仍需检测到两个音节
         
-        # 可视化参数
-        self.volume_bar_length = 50
-        self.volume_max_display = 5000     # 音量显示的最大值
-        self.visualization_update_rate = 0.05  # 可视化更新频率(秒)
+        # 噪声抑制参数：只有能量够、语音频带占比够、过零率不过高的帧才算发声
+        self.min_speech_ratio = 0.5        # 100-3400Hz 能量占比下限，过滤低频嗡声和高频嘶声
+        self.max_zcr = 0.35                # 过零率上限，过滤敲击声、摩擦声等宽带噪声
+        self.hangover = 0.04               # 静音持续该时长(秒)才结束音节，桥接音节内部的能量下陷
+        
+        # 音节切分：逐帧（10ms）判断，时间戳由样本计数换算
+        self.segmenter = SyllableSegmenter(self.sample_rate, self.hangover)
         
         # 状态变量
         self.is_listening = False
-        self.audio_stream = None
+        self.capture = None
+        self.detection_thread = None
+        self.wake_cooldown = 2.0           # 唤醒后忽略输入的时长(秒)，避免重复触发
+        self.cooldown_until = 0            # 冷却结束的流时间(秒)
         self.background_noise_level = 0
         self.last_volume = 0
         
         # 音节检测状态
-        self.in_syllable = False
-        self.syllable_start_time = 0
-        self.syllable_end_time = 0
         self.syllables_detected = []
+        self.max_events = 100              # 只保留最近的唤醒/拒绝事件，长时间运行内存不增长
+        self.wake_events = deque(maxlen=self.max_events)
+        
+        # 唤醒事件的订阅者：回调函数在检测线程中调用，队列由使用方在自己的线程中读取
+        self.subscribers = []
+        self.queues = []
+        self.dropped_events = 0            # 队列满时丢弃的事件数
+        self.callback_errors = 0
+        self.error_count = 0               # 检测线程中处理出错的次数
+        self.last_error = None
         
-        print(f"🎤 优化版简单音频唤醒检测器已初始化")
-        print(f"目标检测: 双音节模式（如'你好'）")
+        # 二次确认：缓存最近2秒音频，音节模式触发后截取两个音节做模板匹配
+        self.verifier = WakeVerifier.load(templates) if templates else None
+        self.verify_margin = 0.05          # 截取音频时在音节两侧多留的时长(秒)
+        self.history = np.zeros(int(2.0 * self.sample_rate), dtype=np.int16)
+        self.rejected_events = deque(maxlen=self.max_events)
+        self.rejected_count = 0            # 累计被模板匹配拒绝的次数
+        if self.verifier is not None:
+            self._log(f"🔐 已加载 {len(self.verifier.templates)} 个唤醒词模板，启用二次确认")
+        
+        self._log(f"🎤 优化版简单音频唤醒检测器已初始化")
+        self._log(f"目标检测: 双音节模式（如'你好'）")
+    
+    def _log(self, message):
+        """启动、停止等非音频路径上的提示信息，静默模式下不输出"""
+        if self.verbose:
+            print(message)
+    
+    def subscribe(self, callback):
+        """注册唤醒回调 callback(event)，在检测线程中调用，应尽快返回"""
+        self.subscribers.append(callback)
+    
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+    
+    def add_queue(self, maxsize=16):
+        """创建一个接收唤醒事件的队列，队列满时丢弃新事件而不阻塞检测线程"""
+        events = queue.Queue(maxsize)
+        self.queues.append(events)
+        return events
+    
+    def remove_queue(self, events):
+        if events in self.queues:
+            self.queues.remove(events)
+    
+    def _publish(self, event):
+        """把唤醒事件分发给所有订阅者"""
+        for callback in list(self.subscribers):
+            try:
+                callback(event)
+            except Exception:
+                self.callback_errors += 1
+        for events in list(self.queues):
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                self.dropped_events += 1
     
     def _calculate_volume(self, audio_data):
         """计算音频数据的音量（RMS值）"""
         if len(audio_data) == 0:
             return 0
         
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
-        rms = np.sqrt(np.mean(audio_array.astype(np.float64) ** 2))
+        audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
+        rms = np.sqrt(np.dot(audio_array, audio_array) / len(audio_array))
         return rms
     
-    def _calibrate_background_noise(self):
-        """校准背景噪音级别"""
-        print("\n🔧 正在校准背景噪音...")
-        print("请保持安静3秒钟，让系统学习环境噪音...")
-        
-        noise_samples = []
-        calibration_duration = 3.0
-        samples_needed = int(calibration_duration * self.sample_rate / self.chunk_size)
-        
-        # 显示进度条
-        self._show_progress_bar(0, samples_needed, prefix="校准进度:")
+    def _analyze_chunk(self, audio_data):
+        """流式提取一块音频的帧特征，返回 (音量, 每帧是否发声, 帧特征)"""
+        features = self.feature_extractor.process(audio_data)
+        if len(features.rms) == 0:
+            return self._calculate_volume(audio_data), np.zeros(0, dtype=bool), features
         
-        for i in range(samples_needed):
-            try:
-                audio_data = self.audio_stream.read(self.chunk_size, exception_on_overflow=False)
-                volume = self._calculate_volume(audio_data)
-                noise_samples.append(volume)
-                
-                # 更新进度条
-                if i % 5 == 0:
-                    self._show_progress_bar(i + 1, samples_needed, prefix="校准进度:")
-                    
-            except Exception as e:
-                print(f"校准过程中出现错误: {e}")
-                break
+        # 块音量取各帧能量的均方根，和原来整块RMS的量纲一致
+        volume = float(np.sqrt(np.mean(features.rms ** 2)))
         
-        if noise_samples:
-            self.background_noise_level = np.mean(noise_samples)
-            self.dynamic_threshold = max(self.background_noise_level * 2.5, self.base_threshold)
-            
-            print(f"\n✅ 背景噪音校准完成")
-            print(f"背景噪音级别: {self.background_noise_level:.1f}")
-            print(f"动态检测阈值: {self.dynamic_threshold:.1f}")
-            
-            # 给用户环境建议
-            if self.background_noise_level < 300:
-                print("📢 环境很安静，检测效果应该很好")
-            elif self.background_noise_level < 800:
-                print("📢 环境有轻微噪音，但应该可以正常工作")
-            else:
-                print("📢 环境比较嘈杂，可能需要更大声说话")
-                print("💡 建议: 尽量在安静环境中使用，或靠近麦克风")
-        else:
-            print("⚠️ 校准失败，将使用默认设置")
+        # 逐帧判断是否发声，噪声尖峰只占一两帧，切出的“音节”会因为过短被丢弃
+        voiced = ((features.rms > self.dynamic_threshold) &
+                  (features.speech_ratio >= self.min_speech_ratio) &
+                  (features.zcr <= self.max_zcr))
+        return volume, voiced, features
     
-    def _show_progress_bar(self, iteration, total, prefix='', suffix='', length=50, fill='█'):
-        """显示进度条"""
-        percent = ("{0:.1f}").format(100 * (iteration / float(total)))
-        filled_length = int(length * iteration // total)
-        bar = fill * filled_length + '-' * (length - filled_length)
-        print(f'\r{prefix} |{bar}| {percent}% {suffix}', end='\r')
-        # 当完成时添加换行
-        if iteration == total: 
-            print()
+    def _update_threshold(self, volume):
+        """用一块非语音音频更新噪声底和动态阈值，每块常数时间"""
+        self.background_noise_level = self.noise_tracker.update(volume, self.chunk_size / self.sample_rate)
+        self.dynamic_threshold = max(self.background_noise_level * self.noise_multiplier, self.base_threshold)
     
-    def _detect_syllable_pattern(self):
-        """实时检测双音节模式"""
+    def _detect_syllable_pattern(self, current_time):
+        """实时检测双音节模式，符合时返回 WakeEvent，否则返回 None"""
         # 确保有足够的音节
         if len(self.syllables_detected) < 2:
-            return False
+            return None
         
         # 获取最后两个音节
         last_two = self.syllables_detected[-2:]
@@ -139,221 +196,296 @@ class SimpleAudioWakeup:
         gap_duration = last_two[1][0] - last_two[0][1]  # 第二个音节开始 - 第一个音节结束
         
         if 0 < gap_duration <= self.max_gap_duration:
-            # 打印检测信息
-            self._clear_line()
-            print(f"🎯 检测到双音节模式！")
-            print(f"   第一音节: {last_two[0][2]:.2f}秒")
-            print(f"   间隔: {gap_duration:.2f}秒") 
-            print(f"   第二音节: {last_two[1][2]:.2f}秒")
-            return True
-        
-        return False
-    
-    def _on_wake_detected(self):
-        """当检测到唤醒模式时的响应"""
-        self._clear_screen()
-        print("\n" + "="*60)
-        print("🔊 检测到'你好'音节模式！")
-        print("📱 设备已唤醒，准备接收指令...")
-        print("="*60)
+            return WakeEvent(current_time, last_two[0], gap_duration, last_two[1])
         
-        print("👋 你好！系统已激活...")
-        
-        # 短暂暂停，避免重复触发
-        time.sleep(2)
-        
-        # 重置检测状态
-        self.syllables_detected = []
+        return None
     
-    def _clear_line(self):
-        """清除当前行"""
-        sys.stdout.write("\033[K")  # 清除到行尾
-        sys.stdout.flush()
-    
-    def _clear_screen(self):
-        """清除屏幕"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-    
-    def _display_volume_visualization(self, volume):
-        """显示音量可视化"""
-        # 计算音量条长度
-        bar_length = int(min(1.0, volume / self.volume_max_display) * self.volume_bar_length)
-        
-        # 确定音量条颜色/符号
-        if volume < self.silence_threshold:
-            bar_char = ' '
-            status = "安静"
-        elif volume < self.dynamic_threshold:
-            bar_char = '░'
-            status = "背景音"
-        else:
-            bar_char = '█'
-            status = "检测中"
+    def _on_wake_detected(self, event):
+        """当检测到唤醒模式时的响应：记录并通知订阅者"""
+        self.wake_events.append(event)
         
-        # 创建音量条
-        volume_bar = bar_char * bar_length + ' ' * (self.volume_bar_length - bar_length)
-        
-        # 显示状态信息
-        status_text = f"音量: {volume:5.1f} | 阈值: {self.dynamic_threshold:5.1f} | 状态: {status}"
-        
-        # 打印音量条和状态
-        self._clear_line()
-        print(f"[{volume_bar}] {status_text}", end='\r')
-        sys.stdout.flush()
+        # 重置检测状态（冷却期由调用方设置，不再阻塞检测线程）
+        self.syllables_detected = []
+        self._publish(event)
     
     def start_listening(self):
         """开始监听音频模式"""
         if not self.audio_available:
-            print("❌ 音频系统不可用，无法开始监听")
+            self._log("❌ 音频系统不可用，无法开始监听")
             return
         
-        self._clear_screen()
-        print(f"🎧 开始监听双音节模式...")
-        print("💡 使用说明:")
-        print("   - 清晰地说'你好'或类似的双音节词")
-        print("   - 每个音节要清晰分开")
-        print("   - 尽量保持适中的音量")
-        print("   - 按 Ctrl+C 退出")
+        self._log(f"🎧 开始监听双音节模式...")
+        self._log("💡 使用说明:")
+        self._log("   - 清晰地说'你好'或类似的双音节词")
+        self._log("   - 每个音节要清晰分开")
+        self._log("   - 尽量保持适中的音量")
+        self._log("   - 按 Ctrl+C 退出")
         
         try:
-            # 初始化音频流
-            self.audio_stream = self.pyaudio.PyAudio().open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                frames_per_buffer=self.chunk_size
-            )
+            # 启动采集：回调把数据写入环形缓冲区，检测在单独的消费者线程中进行；
+            # 流时间从新采集的第0个样本算起
+            self.reset()
+            self.capture = AudioCapture(self.source, self.buffer_seconds).start()
             
-            # 校准背景噪音
-            self._calibrate_background_noise()
-            
-            print(f"\n正在监听中...")
+            # 噪声底在监听过程中持续估计，不需要启动校准
+            self._log(f"\n正在监听中...")
             
             self.is_listening = True
-            last_visualization_time = time.time()
+            self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
+            self.detection_thread.start()
             
-            while self.is_listening:
-                try:
-                    # 读取音频数据
-                    audio_data = self.audio_stream.read(self.chunk_size, exception_on_overflow=False)
-                    current_time = time.time()
-                    
-                    # 计算当前音量
-                    volume = self._calculate_volume(audio_data)
-                    self.last_volume = volume
-                    
-                    # 更新可视化（限制更新频率）
-                    if current_time - last_visualization_time > self.visualization_update_rate:
-                        self._display_volume_visualization(volume)
-                        last_visualization_time = current_time
-                    
-                    # 音节检测逻辑
-                    if volume > self.dynamic_threshold:
-                        # 开始或继续音节
-                        if not self.in_syllable:
-                            self.in_syllable = True
-                            self.syllable_start_time = current_time
-                    else:
-                        # 结束音节
-                        if self.in_syllable:
-                            self.in_syllable = False
-                            self.syllable_end_time = current_time
-                            syllable_duration = self.syllable_end_time - self.syllable_start_time
-                            
-                            # 只记录合理长度的音节
-                            if (self.min_syllable_duration <= syllable_duration <= 
-                                self.max_syllable_duration):
-                                self.syllables_detected.append(
-                                    (self.syllable_start_time, self.syllable_end_time, syllable_duration)
-                                )
-                                
-                                # 限制历史记录长度
-                                if len(self.syllables_detected) > 10:
-                                    self.syllables_detected.pop(0)
-                            
-                            # 检测是否符合双音节模式
-                            if self._detect_syllable_pattern():
-                                self._on_wake_detected()
-                
-                except Exception as e:
-                    print(f"\n⚠️ 音频处理出错: {e}")
-                    time.sleep(0.1)
-                    continue
+            # 主线程只等待检测线程结束（WAV回放完毕）或 Ctrl+C
+            while self.detection_thread.is_alive():
+                self.detection_thread.join(0.2)
                     
         except KeyboardInterrupt:
-            print("\n👋 检测到退出信号...")
+            self._log("\n👋 检测到退出信号...")
             
         except Exception as e:
-            print(f"\n❌ 音频系统错误: {e}")
-            print("💡 建议检查:")
-            print("   - 麦克风是否正常连接")
-            print("   - 系统音频权限设置")
-            print("   - pyaudio库是否正确安装")
+            self.last_error = e
+            self._log(f"\n❌ 音频系统错误: {e}")
+            self._log("💡 建议检查:")
+            self._log("   - 麦克风是否正常连接")
+            self._log("   - 系统音频权限设置")
+            self._log("   - pyaudio库是否正确安装")
             
         finally:
             self.stop_listening()
     
+    def _read_chunk(self, timeout=1.0):
+        """从环形缓冲区读取一块样本，采集结束时返回 None；溢出丢掉的样本在流时间中跳过"""
+        while True:
+            position = self.capture.read(self.chunk_buffer, timeout)
+            if position is not None:
+                break
+            if self.capture.finished:
+                return None
+        expected = self.feature_extractor.sample_count + self.feature_extractor.pending
+        if position > expected:
+            self.feature_extractor.skip(position - expected)
+        return self.chunk_buffer
+    
+    def _detection_loop(self):
+        """消费者线程：按块读取样本并检测"""
+        while self.is_listening:
+            audio_data = self._read_chunk()
+            if audio_data is None:
+                break
+            
+            try:
+                self._process_chunk(audio_data)
+            except Exception as e:
+                # 只记录，由界面线程显示，检测线程不打印
+                self.error_count += 1
+                self.last_error = e
+        
+        self.is_listening = False
+    
+    def reset(self):
+        """清空流式状态，从样本0重新开始计时"""
+        self.feature_extractor.reset()
+        self.segmenter.reset()
+        self.syllables_detected = []
+        self.wake_events.clear()
+        self.rejected_events.clear()
+        self.rejected_count = 0
+        self.cooldown_until = 0
+        self.noise_tracker.reset()
+        if self.adaptive_threshold:
+            self.dynamic_threshold = self.base_threshold
+    
+    def process_audio(self, samples):
+        """
+        离线处理一段完整音频（不经过采集线程），返回其中的唤醒事件列表
+        
+        按 chunk_size 分块送入，和实时监听的处理路径完全相同，结果可复现
+        """
+        self.reset()
+        # wake_events 只保留最近的事件，这里另外收集全部事件
+        events = []
+        self.subscribe(events.append)
+        try:
+            for start in range(0, len(samples) - self.chunk_size + 1, self.chunk_size):
+                self._process_chunk(samples[start:start + self.chunk_size])
+        finally:
+            self.unsubscribe(events.append)
+        return events
+    
+    def _append_history(self, audio_data, end_sample):
+        """把一块样本写入最近音频的环形缓存，end_sample 为块末尾的样本序号"""
+        n = len(audio_data)
+        start = (end_sample - n) % len(self.history)
+        first = min(n, len(self.history) - start)
+        self.history[start:start + first] = audio_data[:first]
+        self.history[:n - first] = audio_data[first:]
+    
+    def _recent_audio(self, start_time, end_time, end_sample):
+        """从环形缓存中取出 [start_time, end_time) 秒的样本，超出缓存范围的部分被截掉"""
+        start = max(int(start_time * self.sample_rate), end_sample - len(self.history), 0)
+        end = min(int(end_time * self.sample_rate), end_sample)
+        indices = np.arange(start, max(start, end)) % len(self.history)
+        return self.history[indices]
+    
+    def _verify(self, event, end_sample):
+        """对触发音节模式的音频做模板匹配，通过返回带距离的事件，否则返回 None"""
+        segment = self._recent_audio(event.first.start - self.verify_margin,
+                                     event.second.end + self.verify_margin, end_sample)
+        accepted, distance = self.verifier.verify(segment, self.sample_rate)
+        event = event._replace(distance=distance)
+        if accepted:
+            return event
+        
+        self.rejected_events.append(event)
+        self.rejected_count += 1
+        self.syllables_detected = []
+        return None
+    
+    def _process_chunk(self, audio_data):
+        """处理一块音频：更新音量显示和音节状态，必要时触发唤醒"""
+        # 计算当前音量和帧特征
+        volume, voiced, features = self._analyze_chunk(audio_data)
+        self.last_volume = volume
+        
+        # 流时间：当前块末尾的样本计数换算成秒
+        end_sample = self.feature_extractor.sample_count + self.feature_extractor.pending
+        current_time = end_sample / self.sample_rate
+        if self.verifier is not None:
+            self._append_history(audio_data, end_sample)
+        
+        # 逐帧切分音节，帧位置取帧中心
+        first_position = features.start_sample + self.feature_extractor.frame_length // 2
+        syllables = self.segmenter.update(voiced, first_position, features.hop)
+        
+        # 非语音时更新噪声底；持续超过最大音节时长的“音节”不可能是语音，同样参与更新，
+        # 避免噪声突然变大后阈值被卡住
+        if self.adaptive_threshold:
+            in_syllable_for = current_time - self.segmenter.start_sample / self.sample_rate
+            if not self.segmenter.in_syllable or in_syllable_for > self.max_syllable_duration:
+                self._update_threshold(volume)
+        
+        for syllable in syllables:
+            # 唤醒后的冷却期内开始的音节不计入
+            if syllable.start < self.cooldown_until:
+                continue
+            
+            # 只记录合理长度的音节
+            if self.min_syllable_duration <= syllable.duration <= self.max_syllable_duration:
+                self.syllables_detected.append(syllable)
+                
+                # 限制历史记录长度
+                if len(self.syllables_detected) > 10:
+                    self.syllables_detected.pop(0)
+            
+            # 检测是否符合双音节模式
+            event = self._detect_syllable_pattern(current_time)
+            if event is not None and self.verifier is not None:
+                event = self._verify(event, end_sample)
+            if event is not None:
+                self._on_wake_detected(event)
+                self.cooldown_until = current_time + self.wake_cooldown
+    
     def stop_listening(self):
         """安全停止监听"""
         self.is_listening = False
         
-        if hasattr(self, 'audio_stream') and self.audio_stream:
-            try:
-                self.audio_stream.stop_stream()
-                self.audio_stream.close()
-                print("\n🔇 音频流已关闭")
-            except:
-                pass
-        
-        print("⏹️ 监听已停止")
-        print("感谢使用优化版简单音频唤醒检测器！")
+        if self.capture is not None:
+            self.capture.close()
+            if self.detection_thread is not None:
+                self.detection_thread.join(timeout=2.0)
+            self._log("\n🔇 音频流已关闭")
+            self._log(f"采集统计: {self.capture.stats()}")
+            self.capture = None
+        
+        self._log("⏹️ 监听已停止")
+        self._log("感谢使用优化版简单音频唤醒检测器！")
 
 
 def main():
     """主程序入口"""
-    print("🎤 优化版简单音频唤醒检测器")
-    print("=" * 50)
-    print("功能亮点:")
-    print("- 实时模式检测，响应更快")
-    print("- 音量可视化反馈")
-    print("- 更直观的状态显示")
-    print("- 通过声音模式检测双音节词汇")
-    print("- 适合检测'你好'等中文词汇")
-    print("=" * 50)
+    parser = argparse.ArgumentParser(description='简单音频唤醒检测器')
+    parser.add_argument('source', nargs='?', default=None, help='WAV 文件路径，用文件代替麦克风')
+    parser.add_argument('--rate', type=int, default=44100, help='采样率，16000 可减少计算量')
+    parser.add_argument('--fast', action='store_true', help='WAV 文件不按实时节奏回放，尽快处理完')
+    parser.add_argument('--templates', default=None, help='wake_enroll.py 录入的模板文件，启用二次确认')
+    parser.add_argument('--silent', action='store_true', help='静默模式：不显示界面，只输出唤醒事件的时间戳')
+    args = parser.parse_args()
+    source = args.source
+    
+    if not args.silent:
+        print("🎤 优化版简单音频唤醒检测器")
+        print("=" * 50)
+        print("功能亮点:")
+        print("- 实时模式检测，响应更快")
+        print("- 音量可视化反馈")
+        print("- 更直观的状态显示")
+        print("- 通过声音模式检测双音节词汇")
+        print("- 适合检测'你好'等中文词汇")
+        print("=" * 50)
     
     # 检查必要的依赖
     try:
         import numpy
-        print("✅ numpy库检查通过")
+        if not args.silent:
+            print("✅ numpy库检查通过")
     except ImportError:
         print("❌ 缺少numpy库，请运行: pip install numpy")
         return
     
-    try:
-        import pyaudio
-        print("✅ pyaudio库检查通过")
-    except ImportError:
-        print("❌ 缺少pyaudio库，请运行: pip install pyaudio")
-        print("💡 如果安装遇到问题，可能需要安装系统级音频库")
-        return
+    if source is None:
+        try:
+            import pyaudio
+            if not args.silent:
+                print("✅ pyaudio库检查通过")
+        except ImportError:
+            print("❌ 缺少pyaudio库，请运行: pip install pyaudio")
+            print("💡 如果安装遇到问题，可能需要安装系统级音频库")
+            return
     
-    print("✅ 依赖检查完成\n")
+    if not args.silent:
+        print("✅ 依赖检查完成\n")
     
+    renderer = None
     try:
         # 创建并启动检测器
-        detector = SimpleAudioWakeup()
+        detector = SimpleAudioWakeup(source, realtime=not args.fast, sample_rate=args.rate,
+                                     templates=args.templates, verbose=not args.silent)
         
-        if detector.audio_available:
-            detector.start_listening()
-        else:
+        if not detector.audio_available:
             print("无法启动音频检测器")
+        elif args.silent:
+            # 静默模式：唤醒事件以一行文本交给上层服务（如 systemd 日志）
+            # 在单独的线程里打印，stdout 阻塞时不会拖住检测线程
+            events = detector.add_queue()
+            done = threading.Event()
+
+            def print_events():
+                while not done.is_set() or not events.empty():
+                    try:
+                        event = events.get(timeout=0.2)
+                    except queue.Empty:
+                        continue
+                    print(f"wake {event.time:.3f}", flush=True)
+
+            printer = threading.Thread(target=print_events, daemon=True)
+            printer.start()
+            try:
+                detector.start_listening()
+            finally:
+                done.set()
+                printer.join()
+                detector.remove_queue(events)
+        else:
+            renderer = ConsoleRenderer(detector).start()
+            detector.start_listening()
             
     except Exception as e:
         print(f"程序运行出错: {e}")
         
     finally:
-        print("程序已结束")
+        if renderer is not None:
+            renderer.stop()
+        if not args.silent:
+            print("程序已结束")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+#唤醒二次确认：音节门限触发后，对缓存的音频算类MFCC特征，与录入的“你好”模板做DTW匹配
+import numpy as np
+
+from audio_capture import resample
+
+
+def mel_filterbank(sample_rate, n_fft, n_mels=20, fmin=80.0, fmax=None):
+    """三角形梅尔滤波器组，返回 (频点数, n_mels) 矩阵，功率谱右乘即得梅尔能量"""
+    fmax = fmax or sample_rate / 2.0
+    to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+    to_hz = lambda m: 700.0 * (10.0 ** (m / 2595.0) - 1.0)
+    edges = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+
+    bank = np.zeros((len(freqs), n_mels), dtype=np.float32)
+    for i in range(n_mels):
+        low, center, high = edges[i], edges[i + 1], edges[i + 2]
+        rising = (freqs - low) / (center - low)
+        falling = (high - freqs) / (high - center)
+        bank[:, i] = np.clip(np.minimum(rising, falling), 0.0, None)
+    return bank
+
+
+def dct_matrix(n_in, n_out):
+    """DCT-II 矩阵 (n_in, n_out)，去掉第0维（整体能量），只保留谱形状"""
+    n = np.arange(n_in)[:, None]
+    k = np.arange(1, n_out + 1)[None, :]
+    return (np.cos(np.pi * k * (2 * n + 1) / (2.0 * n_in)) * np.sqrt(2.0 / n_in)).astype(np.float32)
+
+
+class MfccExtractor:
+    """
+    简化的MFCC：预加重 -> 分帧加窗 -> 功率谱 -> 梅尔能量取对数 -> DCT -> 倒谱均值归一化
+
+    滤波器组和DCT矩阵在构造时算好，每次调用只有几次矩阵运算
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=25.0, hop_ms=10.0, n_mels=20, n_ceps=12):
+        self.sample_rate = sample_rate
+        self.frame_length = int(round(sample_rate * frame_ms / 1000.0))
+        self.hop = int(round(sample_rate * hop_ms / 1000.0))
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hamming(self.frame_length).astype(np.float32)
+        self.mel_bank = mel_filterbank(sample_rate, self.n_fft, n_mels)
+        self.dct = dct_matrix(n_mels, n_ceps)
+
+    def compute(self, samples):
+        """int16 样本 -> (帧数, n_ceps) 特征矩阵，样本不足一帧时返回空矩阵"""
+        x = np.asarray(samples, dtype=np.float32)
+        if len(x) < self.frame_length:
+            return np.zeros((0, self.dct.shape[1]), dtype=np.float32)
+        x = np.append(x[0], x[1:] - 0.97 * x[:-1])
+
+        frames = np.lib.stride_tricks.sliding_window_view(x, self.frame_length)[::self.hop] * self.window
+        spectrum = np.fft.rfft(frames, self.n_fft, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        log_mel = np.log(power @ self.mel_bank + 1e-6)
+        ceps = log_mel @ self.dct
+        return ceps - ceps.mean(axis=0)
+
+
+def dtw_distance(a, b, bound=np.inf):
+    """
+    两个特征序列的DTW距离（按 len(a)+len(b) 归一化）
+
+    逐行计算累积代价：竖直/对角转移整行向量化，行内的水平转移用
+    D[j] = C[j] + min_{k<=j}(T[k] - C[k]) 的前缀最小值一次算完（C 为本行代价的前缀和）。
+    任何规整路径都经过每一行，所以某行的最小累积代价超过 bound 时提前放弃，返回 inf
+    """
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return np.inf
+    norm = float(n + m)
+    limit = bound * norm
+
+    # 帧间欧氏距离矩阵：|a|^2 + |b|^2 - 2ab
+    cost = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+    cost = np.sqrt(np.maximum(cost, 0.0))
+
+    row = np.cumsum(cost[0])
+    if row.min() > limit:
+        return np.inf
+    for i in range(1, n):
+        c = cost[i]
+        # 来自上一行的竖直(i-1,j)和对角(i-1,j-1)转移
+        from_above = row.copy()
+        from_above[1:] = np.minimum(row[1:], row[:-1])
+        prefix = np.cumsum(c)
+        row = prefix + np.minimum.accumulate(from_above + c - prefix)
+        if row.min() > limit:
+            return np.inf
+    return float(row[-1] / norm)
+
+
+class WakeVerifier:
+    """
+    模板匹配确认器
+
+    templates 为录入的特征矩阵列表，threshold 为归一化DTW距离的接受上限。
+    依次与各模板比较，以“当前最佳距离和阈值中较小者”作为提前放弃的界限，
+    后面的模板一旦注定更差就不必算完
+    """
+
+    def __init__(self, templates, sample_rate=16000, threshold=8.0):
+        self.templates = [np.asarray(t, dtype=np.float32) for t in templates]
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.extractor = MfccExtractor(sample_rate)
+
+    def features(self, samples, sample_rate=None):
+        if sample_rate is not None and sample_rate != self.sample_rate:
+            samples = resample(np.asarray(samples, dtype=np.int16), sample_rate, self.sample_rate)
+        return self.extractor.compute(samples)
+
+    def verify(self, samples, sample_rate=None):
+        """返回 (是否通过, 最小归一化DTW距离)，全部提前放弃时距离为 inf"""
+        query = self.features(samples, sample_rate)
+        best = np.inf
+        for template in self.templates:
+            best = min(best, dtw_distance(query, template, min(best, self.threshold)))
+        return best <= self.threshold, best
+
+    def save(self, path):
+        np.savez(path, sample_rate=self.sample_rate, threshold=self.threshold,
+                 **{f'template_{i}': t for i, t in enumerate(self.templates)})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            names = sorted((k for k in data.files if k.startswith('template_')),
+                           key=lambda k: int(k.split('_')[1]))
+            return cls([data[k] for k in names], int(data['sample_rate']), float(data['threshold']))